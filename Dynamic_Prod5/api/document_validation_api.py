@@ -1,25 +1,255 @@
 from datetime import datetime
-import json
+import base64
+import copy
+import orjson
 import traceback
 from typing import Dict, Any, Tuple
-import base64
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+import fastjsonschema
 from services.validation_service import DocumentValidationService
 from models.document_models import (
     ValidationResult, 
     DocumentValidationError
 )
-from utils.logging_utils import logger
+from utils.logging_utils import logger, setup_queue_logging
 from config.settings import Config
 
 import logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('document_validation.log'),
-        logging.StreamHandler()
-    ]
+setup_queue_logging('document_validation.log')
+
+# Input validation constants
+_GST_SERVICE_IDS = frozenset(('4', '5', '6', '7'))
+_VALID_APPLICANT_TYPES = frozenset(('Individual', 'Company'))
+_YES_NO = frozenset(('Yes', 'No'))
+_REQUIRED_DIRECTOR_KEYS = ('nationality', 'authorised', 'documents')
+_REQUIRED_APPLICANT_KEYS = ('applicant_type', 'applicant_name', 'documents')
+_REQUIRED_TRADEMARK_KEYS = ('BrandName', 'Logo', 'AlreadyInUse')
+_NON_DIRECTOR_KEYS = frozenset(('global_errors', 'rule_validations'))
+
+# Trademark entry keys, matching the patternProperties key in SCHEMA_TM
+_RE_TRADEMARK_KEY = re.compile(r'Trademark[0-9]+')
+
+# JSON schema for director/company service input (service_id 1-3)
+SCHEMA_DEFAULT = {
+    "type": "object",
+    "required": ["directors"],
+    "properties": {
+        "directors": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": _REQUIRED_DIRECTOR_KEYS,
+                "properties": {
+                    "documents": {
+                        "type": "object",
+                        "additionalProperties": {"type": ["string", "null"]}
+                    }
+                }
+            }
+        },
+        "companyDocuments": {
+            # Falsy values are treated as "no company documents"; if/else
+            # rather than anyOf so errors point at the offending entry
+            "if": {"enum": [None, "", 0, False, [], {}]},
+            "then": {},
+            "else": {
+                "type": "object",
+                "properties": {"address_proof_type": {}},
+                "additionalProperties": {"type": ["string", "null"]}
+            }
+        }
+    }
+}
+
+# JSON schema for TM service input (service_id 8)
+SCHEMA_TM = {
+    "type": "object",
+    "required": ["request_id", "Trademarks", "applicant"],
+    "properties": {
+        "applicant": {
+            "type": "object",
+            "required": _REQUIRED_APPLICANT_KEYS,
+            "properties": {
+                "applicant_type": {"enum": sorted(_VALID_APPLICANT_TYPES)}
+            },
+            # Company applicants need a company name and an MSME or DIPP certificate
+            "if": {"properties": {"applicant_type": {"const": "Company"}}},
+            "then": {
+                "required": ["company_name"],
+                "properties": {
+                    "documents": {
+                        "type": "object",
+                        "anyOf": [
+                            {
+                                "required": ["msme_certificate"],
+                                "properties": {"msme_certificate": {"not": {"enum": [None, "", 0, False, [], {}]}}}
+                            },
+                            {
+                                "required": ["dipp_certificate"],
+                                "properties": {"dipp_certificate": {"not": {"enum": [None, "", 0, False, [], {}]}}}
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        "Trademarks": {
+            "type": "object",
+            "required": ["TrademarkNos"],
+            "properties": {
+                "TrademarkNos": {"type": "integer", "minimum": 1}
+            },
+            "patternProperties": {
+                "^Trademark[0-9]+$": {
+                    "type": "object",
+                    "required": _REQUIRED_TRADEMARK_KEYS,
+                    "properties": {
+                        "Logo": {"enum": sorted(_YES_NO)},
+                        "AlreadyInUse": {"enum": sorted(_YES_NO)}
+                    },
+                    # Trademarks already in use need at least one verification document
+                    "if": {"properties": {"AlreadyInUse": {"const": "Yes"}}},
+                    "then": {
+                        "required": ["VerificationDocs"],
+                        "properties": {
+                            "VerificationDocs": {
+                                "type": "object",
+                                "minProperties": 1,
+                                "additionalProperties": {
+                                    "type": "object",
+                                    "required": ["url"]
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Compile schemas once at import
+_VALIDATE_DEFAULT = fastjsonschema.compile(SCHEMA_DEFAULT)
+_VALIDATE_TM = fastjsonschema.compile(SCHEMA_TM)
+
+# Client-facing messages for schema failures, as (path, rule, message).
+# None in a path matches any key, and the matched keys fill {0}, {1};
+# "required:<key>" only matches when <key> is the first missing property.
+# {missing} is the first missing property and {value} the offending value.
+# The first matching entry wins.
+_DEFAULT_SCHEMA_ERRORS = (
+    ((), 'required', "Missing required input field: {missing}"),
+    (('directors',), 'type', "Directors must be a dictionary"),
+    (('directors', None), 'type', "Director {0} must be a dictionary"),
+    (('directors', None), 'required', "Missing required field for director {0}: {missing}"),
+    (('directors', None, 'documents'), 'type', "Documents for director {0} must be a dictionary"),
+    (('directors', None, 'documents', None), 'type',
+     "Document URL for {1} in director {0} must be a base64-encoded string or URL"),
+    (('companyDocuments',), 'type', "Company documents must be a dictionary"),
+    (('companyDocuments', None), 'type', "Company document {0} must be a base64-encoded string"),
 )
+_TM_SCHEMA_ERRORS = (
+    ((), 'required:applicant', "Missing required 'applicant' field for TM service"),
+    ((), 'required', "Missing required TM input field: {missing}"),
+    (('applicant',), 'type', "Applicant must be a dictionary"),
+    (('applicant',), 'required:company_name', "Missing 'company_name' for Company applicant type"),
+    (('applicant',), 'required', "Missing required field for applicant: {missing}"),
+    (('applicant', 'applicant_type'), 'enum',
+     "Invalid applicant type: {value}. Must be one of Individual, Company"),
+    (('applicant', 'documents'), 'type', "Applicant documents must be a dictionary"),
+    (('applicant', 'documents'), 'anyOf', "Company applicants must provide either MSME or DIPP certificate"),
+    (('Trademarks',), 'type', "Trademarks must be a dictionary"),
+    (('Trademarks',), 'required', "Missing 'TrademarkNos' in Trademarks"),
+    (('Trademarks', 'TrademarkNos'), None, "TrademarkNos must be a positive integer"),
+    (('Trademarks', None), 'type', "{0} must be a dictionary"),
+    (('Trademarks', None), 'required:VerificationDocs',
+     "At least one verification document is required for {0} with AlreadyInUse='Yes'"),
+    (('Trademarks', None), 'required', "Missing required field for {0}: {missing}"),
+    (('Trademarks', None, 'Logo'), 'enum', "Invalid Logo value for {0}: {value}. Must be 'Yes' or 'No'"),
+    (('Trademarks', None, 'AlreadyInUse'), 'enum',
+     "Invalid AlreadyInUse value for {0}: {value}. Must be 'Yes' or 'No'"),
+    (('Trademarks', None, 'VerificationDocs'), 'type', "VerificationDocs for {0} must be a dictionary"),
+    (('Trademarks', None, 'VerificationDocs'), 'minProperties',
+     "At least one verification document is required for {0} with AlreadyInUse='Yes'"),
+    (('Trademarks', None, 'VerificationDocs', None), 'type',
+     "Verification document {1} for {0} must be a dictionary"),
+    (('Trademarks', None, 'VerificationDocs', None), 'required',
+     "Missing 'url' for verification document {1} in {0}"),
+)
+
+def _schema_error_message(error: fastjsonschema.JsonSchemaValueException, templates: tuple):
+    """
+    Map a schema validation failure to its client-facing message
+    
+    Args:
+        error (JsonSchemaValueException): Failure raised by a compiled schema
+        templates (tuple): (path, rule, message) entries to match against
+    
+    Returns:
+        str: Formatted message, or None if no template matches
+    """
+    path = error.path[1:]  # drop the leading "data"
+    missing = None
+    if error.rule == 'required' and isinstance(error.value, dict):
+        missing = next((key for key in error.rule_definition if key not in error.value), None)
+    
+    for pattern, rule, message in templates:
+        if len(pattern) != len(path):
+            continue
+        if rule is not None and rule not in (error.rule, f"{error.rule}:{missing}"):
+            continue
+        if any(part is not None and part != key for part, key in zip(pattern, path)):
+            continue
+        keys = [key for part, key in zip(pattern, path) if part is None]
+        return message.format(*keys, missing=missing, value=error.value)
+    return None
+
+# Shared skeleton for error responses; deep-copied per error
+_ERROR_TEMPLATE = {
+    "validation_rules": {
+        "global_error": {
+            "status": "failed",
+            "error_message": None
+        }
+    },
+    "document_validation": {
+        "directors": {},
+        "companyDocuments": {}
+    }
+}
+
+# Request-level result cache bounds; the TTL roughly covers a client retry window
+_RESULT_CACHE_MAXSIZE = 128
+_RESULT_CACHE_TTL_SECONDS = 60
+
+# Base64 alphabet with optional trailing padding
+_B64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+def _is_valid_base64(content: str) -> bool:
+    """
+    Check whether a document string is valid base64
+    
+    Args:
+        content (str): Base64-encoded document content
+    
+    Returns:
+        bool: Whether the content decodes as base64
+    """
+    # Scan the alphabet instead of decoding, so no output buffer is allocated
+    if len(content) % 4 == 0 and _B64_RE.fullmatch(content) is not None:
+        return True
+    
+    # Anything else gets the lenient decode this check has always applied,
+    # which skips line breaks and other non-alphabet characters
+    try:
+        base64.b64decode(content, validate=False)
+        return True
+    except ValueError:
+        return False
 
 class DocumentValidationAPI:
     """
@@ -39,6 +269,10 @@ class DocumentValidationAPI:
         """
         self.logger = logging.getLogger(__name__)
         self.validation_service = validation_service or DocumentValidationService()
+        
+        # LRU of (expiry, (standard_result, detailed_result)) keyed by input digest
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
     
     def validate_document(self, input_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
@@ -57,7 +291,15 @@ class DocumentValidationAPI:
             # Extract parameters
             service_id = input_data.get('service_id', '1')
             request_id = input_data.get('request_id', '')
-            if service_id == "4" or service_id == "5" or service_id == "6" or service_id == "7":  # GST service
+            
+            # Serve identical re-submissions from the result cache
+            cache_key = self._result_cache_key(service_id, input_data)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.logger.info("Returning cached validation result for request %s", request_id)
+                return cached
+            
+            if service_id in _GST_SERVICE_IDS:  # GST service
                 #self._validate_gst_input_structure(input_data)
                 nationality = input_data.get('nationality', 'indian')
                 gst_documents = input_data.get('gst_documents', {})
@@ -76,6 +318,7 @@ class DocumentValidationAPI:
                         trademark_data.pop('brand_name_visible', None)
                         trademark_data.pop('brand_name_in_logo', None)
                 formatted_result = self._format_gst_api_response(result, detailed_result)
+                self._store_cached_result(cache_key, (formatted_result, detailed_result))
                 return formatted_result, detailed_result
             # Perform validation
             self._validate_input_structure(input_data)
@@ -100,45 +343,87 @@ class DocumentValidationAPI:
             formatted_result = self._format_api_response(result, detailed_result)
             
             # Return both the API formatted result and the detailed result
+            self._store_cached_result(cache_key, (formatted_result, detailed_result))
             return formatted_result, detailed_result
         
         except Exception as e:
-            self.logger.error(f"Validation API error: {str(e)}", exc_info=True)
+            self.logger.error("Validation API error: %s", e, exc_info=True)
             
             # Create error response
-            error_response = {
-                "validation_rules": {
-                    "global_error": {
-                        "status": "failed",
-                        "error_message": str(e)
-                    }
-                },
-                "document_validation": {
-                    "directors": {},
-                    "companyDocuments": {}
-                }
-            }
+            error_message = str(e)
+            error_response = self._create_error_response(error_message)
             
             # Create detailed error response
-            detailed_error = {
-                "validation_rules": {
-                    "global_error": {
-                        "status": "failed",
-                        "error_message": str(e),
-                        "stacktrace": traceback.format_exc()
-                    }
-                },
-                "document_validation": {
-                    "directors": {},
-                    "companyDocuments": {}
-                },
-                "metadata": {
-                    "timestamp": datetime.now().isoformat(),
-                    "error": str(e)
-                }
+            detailed_error = self._create_error_response(error_message)
+            detailed_error["validation_rules"]["global_error"]["stacktrace"] = traceback.format_exc()
+            detailed_error["metadata"] = {
+                "timestamp": datetime.now().isoformat(),
+                "error": error_message
             }
             
             return error_response, detailed_error
+    
+    def _result_cache_key(self, service_id: str, input_data: Dict[str, Any]):
+        """
+        Build a result cache key from the canonical JSON form of the input
+        
+        Args:
+            service_id (str): Service identifier
+            input_data (dict): Input document data
+        
+        Returns:
+            tuple or None: Cache key, or None if the input is not JSON-serializable
+        """
+        try:
+            canonical = orjson.dumps(input_data, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return None
+        return service_id, hashlib.blake2b(canonical, digest_size=16).digest()
+    
+    def _get_cached_result(self, cache_key) -> Any:
+        """
+        Look up a cached validation result
+        
+        Args:
+            cache_key (tuple): Key from _result_cache_key
+        
+        Returns:
+            tuple or None: Copy of the cached (standard_result, detailed_result)
+        """
+        if cache_key is None:
+            return None
+        
+        with self._result_cache_lock:
+            entry = self._result_cache.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at < time.monotonic():
+                del self._result_cache[cache_key]
+                return None
+            self._result_cache.move_to_end(cache_key)
+        
+        # Callers may mutate the returned dicts, so never hand out the cached objects
+        return copy.deepcopy(results)
+    
+    def _store_cached_result(self, cache_key, results: Tuple[Dict[str, Any], Dict[str, Any]]):
+        """
+        Store a validation result in the cache
+        
+        Args:
+            cache_key (tuple): Key from _result_cache_key
+            results (tuple): (standard_result, detailed_result)
+        """
+        if cache_key is None:
+            return
+        
+        entry = (time.monotonic() + _RESULT_CACHE_TTL_SECONDS, copy.deepcopy(results))
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = entry
+            self._result_cache.move_to_end(cache_key)
+            if len(self._result_cache) > _RESULT_CACHE_MAXSIZE:
+                self._result_cache.popitem(last=False)
+    
     def _validate_gst_input_structure(self, input_data: Dict[str, Any]):
         required_keys = ['service_id', 'request_id', 'nationality', 'gst_documents']
         for key in required_keys:
@@ -186,9 +471,7 @@ class DocumentValidationAPI:
         Raises:
             DocumentValidationError: If input structure is invalid
         """
-        # Debug print
-        print("DEBUG: Validating input structure")
-        print("DEBUG: Input data keys:", list(input_data.keys()))
+        self.logger.debug("Validating input structure, keys: %s", list(input_data.keys()))
         
         # Get service ID
         service_id = input_data.get('service_id', '1')
@@ -198,92 +481,37 @@ class DocumentValidationAPI:
             self._validate_tm_input_structure(input_data)
             return
         
-        # Check for required top-level keys
-        required_keys = ['directors']
-        
-        for key in required_keys:
-            if key not in input_data:
-                raise DocumentValidationError(
-                    f"Missing required input field: {key}"
-                )
-        
-        # Validate directors structure
-        directors = input_data['directors']
-        print("DEBUG: Number of directors:", len(directors))
-        
-        if not isinstance(directors, dict):
+        # Validate structure with the precompiled schema
+        try:
+            _VALIDATE_DEFAULT(input_data)
+        except fastjsonschema.JsonSchemaValueException as e:
             raise DocumentValidationError(
-                "Directors must be a dictionary"
+                _schema_error_message(e, _DEFAULT_SCHEMA_ERRORS)
+                or f"Invalid input structure: {e.message}"
             )
         
+        directors = input_data['directors']
+        self.logger.debug("Number of directors: %d", len(directors))
+        
         # Allow optional companyDocuments
         company_docs = input_data.get('companyDocuments', {})
-        print("DEBUG: Company documents:", company_docs)
         
-        # Validate each director
+        # Validate base64 document content for each director
         for director_key, director_info in directors.items():
-            print(f"DEBUG: Validating director {director_key}")
-            
-            # Ensure director_info is a dictionary
-            if not isinstance(director_info, dict):
-                raise DocumentValidationError(
-                    f"Director {director_key} must be a dictionary"
-                )
-            
-            # Print director info for debugging
-            print(f"DEBUG: Director {director_key} info:", director_info)
-            
-            # Check for required director keys
-            required_director_keys = [
-                'nationality', 
-                'authorised', 
-                'documents'
-            ]
-            
-            for req_key in required_director_keys:
-                if req_key not in director_info:
-                    raise DocumentValidationError(
-                        f"Missing required field for director {director_key}: {req_key}"
-                    )
-            
-            # Validate documents
-            documents = director_info.get('documents', {})
-            if not isinstance(documents, dict):
-                raise DocumentValidationError(
-                    f"Documents for director {director_key} must be a dictionary"
-                )
-            
-            # Optional: Add more specific document validation if needed
-            for doc_key, doc_content in documents.items():
-                if doc_content is not None and not isinstance(doc_content, str):
-                    raise DocumentValidationError(
-                        f"Document URL for {doc_key} in director {director_key} must be a base64-encoded string or URL"
-                    )
-                try:
-                    if doc_content and not doc_content.strip().lower().startswith("http"):
-                        base64.b64decode(doc_content)
-                except Exception:
-                    raise DocumentValidationError(
-                        f"Invalid base64 content for document {doc_key} in director {director_key}"
-                    )
-        # Optional: Validate company documents structure if present
+            for doc_key, doc_content in director_info['documents'].items():
+                if doc_content and not doc_content.strip().lower().startswith("http"):
+                    if not _is_valid_base64(doc_content):
+                        raise DocumentValidationError(
+                            f"Invalid base64 content for document {doc_key} in director {director_key}"
+                        )
+        # Validate base64 content of company documents if present
         if company_docs:
-            if not isinstance(company_docs, dict):
-                raise DocumentValidationError(
-                    "Company documents must be a dictionary"
-                )
             for key, content in company_docs.items():
                 if key == "address_proof_type":  # this is not a document
                     continue
-                if content is not None and not isinstance(content, str):
-                    raise DocumentValidationError(
-                        f"Company document {key} must be a base64-encoded string"
-                    )
-                try:
-                    if content:
-                        base64.b64decode(content)
-                except Exception:
-                    raise DocumentValidationError(f"Invalid base64 content in {key}")
+                if content and not content.strip().lower().startswith("http"):
+                    if not _is_valid_base64(content):
+                        raise DocumentValidationError(f"Invalid base64 content in {key}")
 
     def _validate_tm_input_structure(self, input_data: Dict[str, Any]):
         """
@@ -295,156 +523,38 @@ class DocumentValidationAPI:
         Raises:
             DocumentValidationError: If input structure is invalid
         """
-        # Debug print
-        print("DEBUG: Validating TM input structure")
-        
-        # Check for required top-level keys for TM service
-        required_keys = ['request_id', 'Trademarks']
-        
-        for key in required_keys:
-            if key not in input_data:
-                raise DocumentValidationError(
-                    f"Missing required TM input field: {key}"
-                )
-        
-        # Validate applicant structure (required for TM service)
-        if 'applicant' not in input_data:
-            raise DocumentValidationError(
-                "Missing required 'applicant' field for TM service"
-            )
-        
-        applicant = input_data['applicant']
-        if not isinstance(applicant, dict):
-            raise DocumentValidationError(
-                "Applicant must be a dictionary"
-            )
-        
-        # Check for required applicant keys
-        required_applicant_keys = [
-            'applicant_type', 
-            'applicant_name',
-            'documents'
-        ]
+        self.logger.debug("Validating TM input structure")
         
-        for req_key in required_applicant_keys:
-            if req_key not in applicant:
-                raise DocumentValidationError(
-                    f"Missing required field for applicant: {req_key}"
-                )
-        
-        # Validate applicant type
-        applicant_type = applicant.get('applicant_type')
-        valid_applicant_types = ['Individual', 'Company']
-        
-        if applicant_type not in valid_applicant_types:
+        # Validate structure with the precompiled schema
+        try:
+            _VALIDATE_TM(input_data)
+        except fastjsonschema.JsonSchemaValueException as e:
             raise DocumentValidationError(
-                f"Invalid applicant type: {applicant_type}. Must be one of {', '.join(valid_applicant_types)}"
+                _schema_error_message(e, _TM_SCHEMA_ERRORS)
+                or f"Invalid TM input structure: {e.message}"
             )
         
-        # If Company type, validate company_name and MSME/DIPP certificates
-        if applicant_type == 'Company':
-            if 'company_name' not in applicant:
-                raise DocumentValidationError(
-                    "Missing 'company_name' for Company applicant type"
-                )
-            
-            # Check applicant documents for MSME or DIPP certificate
-            documents = applicant.get('documents', {})
-            if not isinstance(documents, dict):
-                raise DocumentValidationError(
-                    "Applicant documents must be a dictionary"
-                )
-            
-            # Check if at least one of MSME or DIPP is provided
-            if not (documents.get('msme_certificate') or documents.get('dipp_certificate')):
-                raise DocumentValidationError(
-                    "Company applicants must provide either MSME or DIPP certificate"
-                )
-        
-        # Validate Trademarks structure
         trademarks = input_data['Trademarks']
-        if not isinstance(trademarks, dict):
-            raise DocumentValidationError(
-                "Trademarks must be a dictionary"
-            )
-        
-        # Check for TrademarkNos
-        if 'TrademarkNos' not in trademarks:
-            raise DocumentValidationError(
-                "Missing 'TrademarkNos' in Trademarks"
-            )
-        
         trademark_nos = trademarks['TrademarkNos']
-        if not isinstance(trademark_nos, int) or trademark_nos <= 0:
+        
+        # JSON Schema "integer" also admits integral floats such as 1.0
+        if type(trademark_nos) is not int:
             raise DocumentValidationError(
                 "TrademarkNos must be a positive integer"
             )
         
-        # Validate each trademark
+        # Ensure the TrademarkN entries are exactly Trademark1..TrademarkNos
+        trademark_keys = {key for key in trademarks if _RE_TRADEMARK_KEY.fullmatch(key)}
         for i in range(1, trademark_nos + 1):
             trademark_key = f"Trademark{i}"
-            if trademark_key not in trademarks:
+            if trademark_key not in trademark_keys:
                 raise DocumentValidationError(
                     f"Missing {trademark_key} in Trademarks"
                 )
-            
-            trademark = trademarks[trademark_key]
-            if not isinstance(trademark, dict):
-                raise DocumentValidationError(
-                    f"{trademark_key} must be a dictionary"
-                )
-            
-            # Check for required trademark keys
-            required_trademark_keys = [
-                'BrandName',
-                'Logo',
-                'AlreadyInUse'
-            ]
-            
-            for req_key in required_trademark_keys:
-                if req_key not in trademark:
-                    raise DocumentValidationError(
-                        f"Missing required field for {trademark_key}: {req_key}"
-                    )
-            
-            # Validate Logo and AlreadyInUse values
-            logo = trademark.get('Logo')
-            if logo not in ['Yes', 'No']:
-                raise DocumentValidationError(
-                    f"Invalid Logo value for {trademark_key}: {logo}. Must be 'Yes' or 'No'"
-                )
-            
-            already_in_use = trademark.get('AlreadyInUse')
-            if already_in_use not in ['Yes', 'No']:
-                raise DocumentValidationError(
-                    f"Invalid AlreadyInUse value for {trademark_key}: {already_in_use}. Must be 'Yes' or 'No'"
-                )
-            
-            # If AlreadyInUse is Yes, validate VerificationDocs
-            if already_in_use == 'Yes':
-                verification_docs = trademark.get('VerificationDocs', {})
-                if not isinstance(verification_docs, dict):
-                    raise DocumentValidationError(
-                        f"VerificationDocs for {trademark_key} must be a dictionary"
-                    )
-                
-                # Ensure at least one verification document is provided
-                if not verification_docs:
-                    raise DocumentValidationError(
-                        f"At least one verification document is required for {trademark_key} with AlreadyInUse='Yes'"
-                    )
-                
-                # Validate each verification document
-                for doc_key, doc_info in verification_docs.items():
-                    if not isinstance(doc_info, dict):
-                        raise DocumentValidationError(
-                            f"Verification document {doc_key} for {trademark_key} must be a dictionary"
-                        )
-                    
-                    if 'url' not in doc_info:
-                        raise DocumentValidationError(
-                            f"Missing 'url' for verification document {doc_key} in {trademark_key}"
-                        )
+        if len(trademark_keys) != trademark_nos:
+            raise DocumentValidationError(
+                f"TrademarkNos is {trademark_nos} but {len(trademark_keys)} trademarks were provided"
+            )
         
     
     def _format_api_response(self, result: ValidationResult, detailed_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -480,7 +590,7 @@ class DocumentValidationAPI:
             dict: Formatted API response
         """
         # Debug logging
-        self.logger.debug(f"Formatting API response from validation results")
+        self.logger.debug("Formatting API response from validation results")
         # Service-specific formatting
         service_id = detailed_result.get('metadata', {}).get('service_id', '1')
         
@@ -488,61 +598,62 @@ class DocumentValidationAPI:
         if service_id == "8":
             return self._format_tm_api_response(result, detailed_result)
         
-        # Initialize the response structure
+        # Initialize the response structure, using validation rules directly from the result
         api_response = {
-            "validation_rules": {},
+            "validation_rules": result.get('validation_rules', {}),
             "document_validation": {
                 "directors": {},
                 "companyDocuments": {}
             }
         }
         
-        # Print detailed info for debugging
-        print("DEBUG: Standard result validation rules:", json.dumps(result.get('validation_rules', {}), indent=2))
-        print("DEBUG: Detailed result:", json.dumps(detailed_result.get('metadata', {}), indent=2))
+        # Log detailed info for debugging (serialization only runs when DEBUG is enabled)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Standard result validation rules: %s", orjson.dumps(result.get('validation_rules', {}), option=orjson.OPT_INDENT_2).decode())
+            self.logger.debug("Detailed result metadata: %s", orjson.dumps(detailed_result.get('metadata', {}), option=orjson.OPT_INDENT_2).decode())
         
-        # Use validation rules directly from the result if available
-        validation_rules = result.get('validation_rules', {})
-        
-        # Add validation rules to API response
-        api_response["validation_rules"] = validation_rules
+        # Bind the input and output sections once
+        document_validation = result.get('document_validation', {})
+        directors_out = api_response["document_validation"]["directors"]
+        company_docs_out = api_response["document_validation"]["companyDocuments"]
         
         # Process directors with robust error handling
-        directors_data = result.get('document_validation', {}).get('directors', {})
+        directors_data = document_validation.get('directors', {})
         if not isinstance(directors_data, dict):
-            self.logger.error(f"Expected directors_data to be a dictionary, got {type(directors_data)}")
+            self.logger.error("Expected directors_data to be a dictionary, got %s", type(directors_data))
             directors_data = {}  # Convert to empty dict to avoid further errors
         
         for director_id, director_data in directors_data.items():
             # Skip special keys like 'global_errors' or 'rule_validations'
-            if director_id in ['global_errors', 'rule_validations']:
+            if director_id in _NON_DIRECTOR_KEYS:
                 continue
                 
             # Type check for director_data
             if not isinstance(director_data, dict):
-                self.logger.warning(f"Director data for {director_id} is not a dictionary, got {type(director_data)}. Skipping.")
+                self.logger.warning("Director data for %s is not a dictionary, got %s. Skipping.", director_id, type(director_data))
                 continue
             
             # Initialize director entry
-            api_response["document_validation"]["directors"][director_id] = {
+            director_entry = directors_out[director_id] = {
                 "nationality": director_data.get('nationality', 'Unknown'),
                 "documents": {}
             }
+            docs_out = director_entry["documents"]
             
             # Add authorized status if available
             if 'is_authorised' in director_data:
-                api_response["document_validation"]["directors"][director_id]["authorized"] = director_data.get('is_authorised', False)
+                director_entry["authorized"] = director_data.get('is_authorised', False)
             
             # Process director documents with type checking
             documents = director_data.get('documents', {})
             if not isinstance(documents, dict):
-                self.logger.warning(f"Documents for director {director_id} is not a dictionary, got {type(documents)}. Skipping.")
+                self.logger.warning("Documents for director %s is not a dictionary, got %s. Skipping.", director_id, type(documents))
                 continue
                     
             for doc_id, doc_data in documents.items():
                 # Type check for document data
                 if not isinstance(doc_data, dict):
-                    self.logger.warning(f"Document data for {doc_id} in director {director_id} is not a dictionary, got {type(doc_data)}. Skipping.")
+                    self.logger.warning("Document data for %s in director %s is not a dictionary, got %s. Skipping.", doc_id, director_id, type(doc_data))
                     continue
                     
                 # Determine document status
@@ -564,22 +675,28 @@ class DocumentValidationAPI:
                     error_messages.append("Verification failed")
                 
                 # Add document to response
-                api_response["document_validation"]["directors"][director_id]["documents"][doc_id] = {
+                docs_out[doc_id] = {
                     "status": status,
                     "error_messages": error_messages
                 }
         
         # Process company documents with type checking
-        company_docs = result.get('document_validation', {}).get('companyDocuments', {})
+        company_docs = document_validation.get('companyDocuments', {})
         if not isinstance(company_docs, dict):
-            self.logger.warning(f"Company documents is not a dictionary, got {type(company_docs)}. Skipping.")
+            self.logger.warning("Company documents is not a dictionary, got %s. Skipping.", type(company_docs))
             company_docs = {}
         
+        # Split validation errors into owner (NOC) and other (address proof) errors in one pass
+        owner_errors = []
+        other_errors = []
+        for error in company_docs.get('validation_errors', []):
+            (owner_errors if "owner" in error.lower() else other_errors).append(error)
+        
         # Process address proof
         if 'addressProof' in company_docs:
             address_proof = company_docs.get('addressProof', {})
             if not isinstance(address_proof, dict):
-                self.logger.warning(f"Address proof is not a dictionary, got {type(address_proof)}. Using default values.")
+                self.logger.warning("Address proof is not a dictionary, got %s. Using default values.", type(address_proof))
                 address_proof = {}
                     
             status = "Valid" if address_proof.get('is_valid', False) else "Not Valid"
@@ -589,12 +706,11 @@ class DocumentValidationAPI:
                 error_messages.append(address_proof['error'])
             
             # Add validation errors if available
-            validation_errors = company_docs.get('validation_errors', [])
-            for error in validation_errors:
-                if error not in error_messages and "owner" not in error.lower():
+            for error in other_errors:
+                if error not in error_messages:
                     error_messages.append(error)
             
-            api_response["document_validation"]["companyDocuments"]["addressProof"] = {
+            company_docs_out["addressProof"] = {
                 "status": status,
                 "error_messages": error_messages
             }
@@ -603,7 +719,7 @@ class DocumentValidationAPI:
         if 'noc' in company_docs:
             noc = company_docs.get('noc', {})
             if not isinstance(noc, dict):
-                self.logger.warning(f"NOC is not a dictionary, got {type(noc)}. Using default values.")
+                self.logger.warning("NOC is not a dictionary, got %s. Using default values.", type(noc))
                 noc = {}
                     
             status = "Valid" if noc.get('is_valid', False) else "Not Valid"
@@ -613,19 +729,19 @@ class DocumentValidationAPI:
                 error_messages.append(noc['error'])
             
             # Add owner-related validation errors
-            validation_errors = company_docs.get('validation_errors', [])
-            for error in validation_errors:
-                if error not in error_messages and "owner" in error.lower():
+            for error in owner_errors:
+                if error not in error_messages:
                     error_messages.append(error)
             
-            api_response["document_validation"]["companyDocuments"]["noc"] = {
+            company_docs_out["noc"] = {
                 "status": status,
                 "error_messages": error_messages
             }
         
         # Final logging
-        self.logger.debug(f"API response formatted with {len(api_response['validation_rules'])} validation rules")
-        print("DEBUG: Formatted API response:", json.dumps(api_response['validation_rules'], indent=2))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("API response formatted with %d validation rules", len(api_response['validation_rules']))
+            self.logger.debug("Formatted API response: %s", orjson.dumps(api_response['validation_rules'], option=orjson.OPT_INDENT_2).decode())
         
         return api_response
     def _format_tm_api_response(self, result: Dict[str, Any], detailed_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -640,42 +756,25 @@ class DocumentValidationAPI:
             dict: Formatted API response
         """
         # Debug logging
-        self.logger.debug(f"Formatting TM API response from validation results")
+        self.logger.debug("Formatting TM API response from validation results")
         
-        # Initialize the response structure
+        # TM results are already in response shape, so pass the sections
+        # through directly instead of filling an empty skeleton
+        document_validation = result.get('document_validation', {})
         api_response = {
-            "validation_rules": {},
+            "validation_rules": result.get('validation_rules', {}),
             "document_validation": {
-                "applicant": {},
-                "trademarks": {},
-                "directors": {},
-                "companyDocuments": {}
+                "applicant": document_validation.get('applicant', {}),
+                "trademarks": document_validation.get('trademarks', {}),
+                "directors": document_validation.get('directors', {}),
+                "companyDocuments": document_validation.get('companyDocuments', {})
             }
         }
         
-        # Add validation rules
-        api_response["validation_rules"] = result.get('validation_rules', {})
-        
-        # Add document validation data
-        document_validation = result.get('document_validation', {})
-        
-        # Add applicant validation
-        api_response["document_validation"]["applicant"] = document_validation.get('applicant', {})
-        
-        # Add trademark validation
-        api_response["document_validation"]["trademarks"] = document_validation.get('trademarks', {})
-        
-        # Add directors validation if available
-        if 'directors' in document_validation:
-            api_response["document_validation"]["directors"] = document_validation.get('directors', {})
-        
-        # Add company documents validation if available
-        if 'companyDocuments' in document_validation:
-            api_response["document_validation"]["companyDocuments"] = document_validation.get('companyDocuments', {})
-        
         # Final logging
-        self.logger.debug(f"TM API response formatted with {len(api_response['validation_rules'])} validation rules")
-        print("DEBUG: Formatted TM API response:", json.dumps(api_response['validation_rules'], indent=2))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("TM API response formatted with %d validation rules", len(api_response['validation_rules']))
+            self.logger.debug("Formatted TM API response: %s", orjson.dumps(api_response['validation_rules'], option=orjson.OPT_INDENT_2).decode())
         
         return api_response
     
@@ -690,13 +789,13 @@ class DocumentValidationAPI:
             dict: Validation results
         """
         try:
-            with open(file_path, 'r') as file:
-                input_data = json.load(file)
+            with open(file_path, 'rb') as file:
+                input_data = orjson.loads(file.read())
             
             api_response, _ = self.validate_document(input_data)
             return api_response
         
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON in file: {file_path}")
             return self._create_error_response("Invalid JSON file")
         
@@ -718,15 +817,6 @@ class DocumentValidationAPI:
         Returns:
             dict: Formatted error response
         """
-        return {
-            "validation_rules": {
-                "global_error": {
-                    "status": "failed",
-                    "error_message": error_message
-                }
-            },
-            "document_validation": {
-                "directors": {},
-                "companyDocuments": {}
-            }
-        }
+        error_response = copy.deepcopy(_ERROR_TEMPLATE)
+        error_response["validation_rules"]["global_error"]["error_message"] = error_message
+        return error_response
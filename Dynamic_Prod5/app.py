@@ -1,44 +1,98 @@
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.exceptions import RequestValidationError
+from starlette.responses import Response
+from starlette.routing import Route
 import uvicorn
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
 import time
 # Import our validation API
 from api.document_validation_api import DocumentValidationAPI
+from config.settings import Config
+from utils.logging_utils import setup_queue_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_server.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging - records are queued and written by a background listener
+setup_queue_logging('api_server.log')
 
 logger = logging.getLogger("document-validation-api")
 
 # Initialize the validation service
 validation_api = DocumentValidationAPI()
 
+# Validation is blocking (downloads, OCR, OpenAI calls), so it runs on a
+# dedicated pool to keep the event loop free for other in-flight requests
+validation_executor = ThreadPoolExecutor(
+    max_workers=Config.VALIDATION_THREADS,
+    thread_name_prefix="validation"
+)
+
+_CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_CORS_MAX_AGE = b"600"
+
+class LiteCORS:
+    """
+    Minimal pure-ASGI CORS middleware for a wildcard, credentialed policy
+    
+    Preflight OPTIONS requests are answered directly at the ASGI layer
+    without reaching the app; other cross-origin responses get the
+    request Origin echoed back (required when credentials are allowed).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope["headers"])
+        origin = headers.get(b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in headers:
+            cors_headers += [
+                (b"access-control-allow-methods", _CORS_ALLOW_METHODS),
+                (b"access-control-max-age", _CORS_MAX_AGE),
+                (b"content-length", b"2"),
+                (b"content-type", b"text/plain; charset=utf-8"),
+            ]
+            requested_headers = headers.get(b"access-control-request-headers")
+            if requested_headers:
+                cors_headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": cors_headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
 # Create the FastAPI app
 app = FastAPI(
     title="Document Validation API",
     description="API for validating director, company, and TM documents (base64 or URL accepted for all files)",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware (allows any origin; in production, restrict origins)
+app.add_middleware(LiteCORS)
 
 # Flexible input model for all services
 class ValidationRequest(BaseModel):
@@ -52,22 +106,33 @@ class ValidationRequest(BaseModel):
     nationality: Optional[str] = None
     gst_documents: Optional[Dict[str, Any]] = None
     # Accept any extra fields
-    class Config:
-        extra = "allow"
+    # Numeric ids (e.g. "service_id": 4) are coerced to str during validation
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+# Compiled once at import and reused for every request body
+VALIDATION_REQUEST_ADAPTER = TypeAdapter(ValidationRequest)
 
-# Map service_id to expected document keys for GST services
+# Map service_id to expected document keys for GST services (frozensets for O(1) membership)
+_GST_BASE_DOCS = ("aadhar_front", "aadhar_back", "pan", "passport_photo", "signature", "noc", "electricity_bill")
 GST_SERVICE_DOCS = {
-    "4": ["aadhar_front", "aadhar_back", "pan", "passport_photo", "signature", "noc", "electricity_bill"],
-    "5": ["aadhar_front", "aadhar_back", "pan", "passport_photo", "signature", "noc", "electricity_bill", "rental_agreement"],
-    "6": ["aadhar_front", "aadhar_back", "pan", "passport_photo", "signature", "noc", "electricity_bill", "consent_letter"],
-    "7": ["aadhar_front", "aadhar_back", "pan", "passport_photo", "signature", "noc", "electricity_bill", "board_resolution"],
+    "4": frozenset(_GST_BASE_DOCS),
+    "5": frozenset(_GST_BASE_DOCS + ("rental_agreement",)),
+    "6": frozenset(_GST_BASE_DOCS + ("consent_letter",)),
+    "7": frozenset(_GST_BASE_DOCS + ("board_resolution",)),
 }
 
+# Service-id groups used to route /validate requests
+_TM_SERVICE_IDS = frozenset({"8"})
+_GST_SERVICE_IDS = frozenset(GST_SERVICE_DOCS)
+_DIRECTOR_SERVICE_IDS = frozenset({"1", "2", "3"})
+
 # Define error handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    # HTTPException and RequestValidationError never reach this handler -
+    # FastAPI's built-in handlers answer them without logging a traceback
+    logger.error("Global exception: %s", exc, exc_info=exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -75,89 +140,116 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+@app.on_event("shutdown")
+def shutdown_validation_executor():
+    validation_executor.shutdown(wait=False, cancel_futures=True)
+
+# Health check endpoint - a bare Starlette route serving a prebuilt response,
+# so load-balancer probes skip FastAPI's request/response handling
+_HEALTHY_RESPONSE = Response(b'{"status":"healthy"}', media_type="application/json")
 
-@app.post("/validate", response_model=Dict[str, Any])
-async def validate_documents(request: ValidationRequest):
+async def health_check(_request):
+    return _HEALTHY_RESPONSE
+
+app.router.routes.insert(0, Route("/health", health_check, methods=["GET"]))
+
+@app.post(
+    "/validate",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ValidationRequest.model_json_schema()}},
+        }
+    },
+)
+async def validate_documents(http_request: Request):
+    # Validate the raw JSON body straight into the model with the cached adapter
     try:
-        start_time = time.time()
-        logger.info(f"Processing validation request: {request.request_id}")
-        input_data = request.dict()
+        request = VALIDATION_REQUEST_ADAPTER.validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
 
-        service_id = str(input_data.get("service_id", "1"))
+    try:
+        start_time = time.time()
+        # Read fields straight off the validated model; no need to dump the payload
+        service_id = request.service_id
+        request_id = request.request_id
+        logger.info("Processing validation request: %s", request_id)
 
         # TM Service (service_id == 8)
-        if service_id == "8":
-            if not input_data.get("Trademarks"):
+        if service_id in _TM_SERVICE_IDS:
+            if not request.Trademarks:
                 raise HTTPException(
                     status_code=422,
                     detail="Trademarks information is required for TM service"
                 )
-            if not input_data.get("applicant"):
+            if not request.applicant:
                 raise HTTPException(
                     status_code=422,
                     detail="Applicant information is required for TM service"
                 )
             filtered_input = {
                 "service_id": service_id,
-                "request_id": input_data.get("request_id"),
-                "preconditions": input_data.get("preconditions"),
-                "applicant": input_data.get("applicant"),
-                "Trademarks": input_data.get("Trademarks")
+                "request_id": request_id,
+                "preconditions": request.preconditions,
+                "applicant": request.applicant,
+                "Trademarks": request.Trademarks
             }
         # GST Services (service_id 4,5,6,7)
-        elif service_id in GST_SERVICE_DOCS:
+        elif service_id in _GST_SERVICE_IDS:
             # Accept both "gst_documents" and "gstDocuments" keys
-            gst_docs = input_data.get("gst_documents") or input_data.get("gstDocuments") or {}
+            gst_docs = request.gst_documents or (request.model_extra or {}).get("gstDocuments") or {}
             # If the input is a mixed payload, extract only relevant docs for this service
             expected_keys = GST_SERVICE_DOCS[service_id]
             filtered_gst_docs = {k: v for k, v in gst_docs.items() if k in expected_keys} if gst_docs else {}
             # Add nationality if present
-            nationality = input_data.get("nationality", "Indian")
+            nationality = request.nationality
             filtered_input = {
                 "service_id": service_id,
-                "request_id": input_data.get("request_id"),
+                "request_id": request_id,
                 "nationality": nationality,
                 "gst_documents": filtered_gst_docs
             }
         # Other services (e.g., director/company validation)
         else:
-            if service_id not in ["1", "2", "3"]:
+            if service_id not in _DIRECTOR_SERVICE_IDS:
                 raise HTTPException(
                     status_code=422,
                     detail="Invalid service_id. Please provide a valid service_id (1, 2, or 3) for director/company validation."
                 )
-            if not input_data.get("directors"):
+            if not request.directors:
                 raise HTTPException(
                     status_code=422,
                     detail="Directors information is required for non-TM services"
                 )
-            if not input_data.get("companyDocuments"):
+            if not request.companyDocuments:
                 raise HTTPException(
                     status_code=422,
                     detail="Company documents are required for non-TM services"
                 )
             filtered_input = {
                 "service_id": service_id,
-                "request_id": input_data.get("request_id"),
-                "preconditions": input_data.get("preconditions"),
-                "directors": input_data.get("directors"),
-                "companyDocuments": input_data.get("companyDocuments")
+                "request_id": request_id,
+                "preconditions": request.preconditions,
+                "directors": request.directors,
+                "companyDocuments": request.companyDocuments
             }
 
         # Process validation
-        api_response, _ = validation_api.validate_document(filtered_input)
+        loop = asyncio.get_running_loop()
+        api_response, _ = await loop.run_in_executor(
+            validation_executor, validation_api.validate_document, filtered_input
+        )
         elapsed = time.time() - start_time
-        logger.info(f"Validation completed for request: {request.request_id} in {elapsed:.2f} seconds")
-        return api_response
+        logger.info("Validation completed for request: %s in %.2f seconds", request_id, elapsed)
+        # api_response is already a plain dict; serialise it directly instead of
+        # round-tripping it through a Pydantic response model
+        return ORJSONResponse(content=api_response)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing validation request: {str(e)}", exc_info=True)
+        logger.error("Error processing validation request: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Validation processing error: {str(e)}"
@@ -175,5 +267,13 @@ async def root():
     }
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=Config.API_WORKERS,
+        log_level="warning"
+    )
 
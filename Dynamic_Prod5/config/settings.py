@@ -1,10 +1,13 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
-# Load environment variables
-load_dotenv()
+from dotenv import load_dotenv
 
-class Config:
+@dataclass(frozen=True, slots=True)
+class Settings:
     """
     Centralized configuration management for the document validation system
     
@@ -13,45 +16,60 @@ class Config:
     - OpenAI API configuration
     - Logging settings
     - API and validation rule configurations
+    
+    Instances are immutable; use get_config() for the shared,
+    environment-loaded instance.
     """
     
     # Elasticsearch Configuration
-    ELASTICSEARCH_HOST = os.getenv(
-        'ELASTICSEARCH_HOST',
-        'https://my-deployment-3eafc9.es.ap-south-1.aws.elastic-cloud.com:9243'
-    )
-
-    ELASTICSEARCH_USERNAME = os.getenv('ELASTICSEARCH_USERNAME', 'elastic')
-    ELASTICSEARCH_PASSWORD = os.getenv('ELASTICSEARCH_PASSWORD', '')
+    ELASTICSEARCH_HOST: str
+    ELASTICSEARCH_USERNAME: str
+    ELASTICSEARCH_PASSWORD: str
 
     # OpenAI Configuration
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+    OPENAI_API_KEY: str
 
     # Logging Configuration
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE = os.getenv('LOG_FILE', 'document_validation.log')
+    LOG_LEVEL: str
+    LOG_FILE: str
 
     # API Configurations
-    API_BASE_URL = os.getenv('API_BASE_URL', 'https://qe-vsapi.vakilsearch.com/api/v1')
+    API_BASE_URL: str
+    API_WORKERS: int
+    VALIDATION_THREADS: int
+    DOC_WORKERS: int
+
+    # Passport-photo face detection; path to a YuNet ONNX model, or empty
+    # to use OpenCV's bundled Haar cascade
+    FACE_DETECTION_MODEL: str
+
+    # Accept passport photos OpenCV confirms without asking the AI model.
+    # Off by default: OpenCV does not check background, eyewear, masks or
+    # face coverings, which the model's prompt does
+    LOCAL_PASSPORT_PHOTO_CHECK: bool
 
     # Document Validation Rules
-    VALIDATION_RULES_INDEX = os.getenv('VALIDATION_RULES_INDEX', 'compliance_rules')
+    VALIDATION_RULES_INDEX: str
+
+    # Elasticsearch connection parameters, built once in __post_init__
+    _elasticsearch_config: Mapping = field(init=False, repr=False, compare=False)
 
-    @classmethod
-    def get_elasticsearch_config(cls):
+    def __post_init__(self):
+        object.__setattr__(self, '_elasticsearch_config', MappingProxyType({
+            'hosts': [self.ELASTICSEARCH_HOST],
+            'http_auth': (self.ELASTICSEARCH_USERNAME, self.ELASTICSEARCH_PASSWORD)
+        }))
+
+    def get_elasticsearch_config(self):
         """
         Get Elasticsearch connection configuration
         
         Returns:
-            dict: Elasticsearch connection parameters
+            Mapping: Read-only Elasticsearch connection parameters
         """
-        return {
-            'hosts': [cls.ELASTICSEARCH_HOST],
-            'http_auth': (cls.ELASTICSEARCH_USERNAME, cls.ELASTICSEARCH_PASSWORD)
-        }
+        return self._elasticsearch_config
 
-    @classmethod
-    def validate_config(cls):
+    def validate_config(self):
         """
         Validate critical configuration parameters
         
@@ -61,13 +79,13 @@ class Config:
         errors = []
         
         # Check critical configurations
-        if not cls.ELASTICSEARCH_HOST:
+        if not self.ELASTICSEARCH_HOST:
             errors.append("Missing Elasticsearch Host")
         
-        if not cls.ELASTICSEARCH_USERNAME:
+        if not self.ELASTICSEARCH_USERNAME:
             errors.append("Missing Elasticsearch Username")
         
-        if not cls.ELASTICSEARCH_PASSWORD:
+        if not self.ELASTICSEARCH_PASSWORD:
             errors.append("Missing Elasticsearch Password")
         
         # Log errors if any
@@ -77,4 +95,35 @@ class Config:
                 print(f"- {error}")
             return False
         
-        return True
\ No newline at end of file
+        return True
+
+@lru_cache(maxsize=1)
+def get_config() -> Settings:
+    """
+    Load configuration from the environment (and .env) once
+    
+    Returns:
+        Settings: Shared immutable configuration
+    """
+    load_dotenv()
+    return Settings(
+        ELASTICSEARCH_HOST=os.getenv(
+            'ELASTICSEARCH_HOST',
+            'https://my-deployment-3eafc9.es.ap-south-1.aws.elastic-cloud.com:9243'
+        ),
+        ELASTICSEARCH_USERNAME=os.getenv('ELASTICSEARCH_USERNAME', 'elastic'),
+        ELASTICSEARCH_PASSWORD=os.getenv('ELASTICSEARCH_PASSWORD', ''),
+        OPENAI_API_KEY=os.getenv('OPENAI_API_KEY', ''),
+        LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO'),
+        LOG_FILE=os.getenv('LOG_FILE', 'document_validation.log'),
+        API_BASE_URL=os.getenv('API_BASE_URL', 'https://qe-vsapi.vakilsearch.com/api/v1'),
+        API_WORKERS=int(os.getenv('API_WORKERS', '1')),
+        VALIDATION_THREADS=int(os.getenv('VALIDATION_THREADS', str((os.cpu_count() or 1) * 4))),
+        DOC_WORKERS=int(os.getenv('DOC_WORKERS', '16')),
+        FACE_DETECTION_MODEL=os.getenv('FACE_DETECTION_MODEL', ''),
+        LOCAL_PASSPORT_PHOTO_CHECK=os.getenv('LOCAL_PASSPORT_PHOTO_CHECK', 'false').lower() in ('1', 'true', 'yes'),
+        VALIDATION_RULES_INDEX=os.getenv('VALIDATION_RULES_INDEX', 'compliance_rules'),
+    )
+
+# Shared configuration instance, accessed as Config.<SETTING> across the project
+Config = get_config()
@@ -11,6 +11,7 @@ from .document_models import (
     DocumentInfo,
     DirectorDocuments,
     CompanyDocuments,
+    ProcessedDocument,
     ValidationResult,
     ValidationRuleStatus,
     DocumentValidationError,
@@ -1,7 +1,8 @@
+import json
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceRule:
     """
     Represents a single compliance rule
@@ -13,7 +14,7 @@ class ComplianceRule:
     is_active: bool = True
     conditions: Dict = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceRuleSet:
     """
     Collection of compliance rules for a specific service
@@ -21,6 +22,11 @@ class ComplianceRuleSet:
     service_id: str
     service_name: str
     rules: List[ComplianceRule] = field(default_factory=list)
+    _rule_index: Dict[str, ComplianceRule] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Index rules by ID once so lookups don't scan the whole list
+        self._rule_index = {rule.rule_id: rule for rule in self.rules}
     
     def get_rule_by_id(self, rule_id: str) -> Optional[ComplianceRule]:
         """
@@ -32,10 +38,7 @@ class ComplianceRuleSet:
         Returns:
             ComplianceRule or None: Matching rule
         """
-        for rule in self.rules:
-            if rule.rule_id == rule_id:
-                return rule
-        return None
+        return self._rule_index.get(rule_id)
     
     def validate_ruleset(self) -> bool:
         """
@@ -44,9 +47,8 @@ class ComplianceRuleSet:
         Returns:
             bool: Whether the ruleset is valid
         """
-        # Check for duplicate rule IDs
-        rule_ids = [rule.rule_id for rule in self.rules]
-        return len(rule_ids) == len(set(rule_ids))
+        # Duplicate rule IDs collapse into a single index entry
+        return len(self.rules) == len(self._rule_index)
 
 def load_compliance_rules_from_config(config_path: str) -> Optional[ComplianceRuleSet]:
     """
@@ -59,8 +61,6 @@ def load_compliance_rules_from_config(config_path: str) -> Optional[ComplianceRu
         ComplianceRuleSet or None: Loaded ruleset
     """
     try:
-        import json
-        
         with open(config_path, 'r') as config_file:
             config_data = json.load(config_file)
         
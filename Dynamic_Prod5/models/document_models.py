@@ -1,7 +1,11 @@
+import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from enum import Enum, auto
 
+# http(s) scheme followed by a non-empty host; matches what urlparse accepted
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$', re.IGNORECASE)
+
 class DocumentType(Enum):
     """Enum for document types"""
     AADHAR_FRONT = auto()
@@ -20,7 +24,7 @@ class NationalityType(Enum):
     INDIAN = "Indian"
     FOREIGN = "Foreign"
 
-@dataclass
+@dataclass(slots=True)
 class DocumentInfo:
     """
     Represents a single document's information
@@ -33,7 +37,7 @@ class DocumentInfo:
     is_recent: Optional[bool] = None  # Added for recency check
     is_masked: Optional[bool] = None  # Added for masked Aadhar check
 
-@dataclass
+@dataclass(slots=True)
 class DirectorDocuments:
     """
     Represents documents for a single director
@@ -44,7 +48,7 @@ class DirectorDocuments:
     age: Optional[int] = None  # Added for age verification
     documents: Dict[DocumentType, DocumentInfo] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class CompanyDocuments:
     """
     Represents company-level documents
@@ -53,7 +57,19 @@ class CompanyDocuments:
     address_proof: DocumentInfo
     noc: Optional[DocumentInfo] = None  # Added for NOC
 
-@dataclass
+@dataclass(slots=True)
+class ProcessedDocument:
+    """
+    A successfully extracted director document, as held by the document pool
+    
+    Converted to a plain dict with dataclasses.asdict when returned to callers
+    """
+    url: str
+    document_type: str
+    is_valid: bool
+    extracted_data: Dict = field(default_factory=dict)
+
+@dataclass(slots=True)
 class ValidationResult:
     """
     Comprehensive validation result
@@ -97,15 +113,7 @@ def validate_url(url: str) -> bool:
     Returns:
         bool: Whether URL is valid
     """
-    try:
-        from urllib.parse import urlparse
-        result = urlparse(url)
-        return all([
-            result.scheme in ['http', 'https'],
-            result.netloc
-        ])
-    except Exception:
-        return False
+    return isinstance(url, str) and _URL_RE.match(url) is not None
     
 # Add these classes to document_models.py
 
@@ -114,25 +122,25 @@ class ApplicantType(Enum):
     INDIVIDUAL = "Individual"
     COMPANY = "Company"
 
-@dataclass
+@dataclass(slots=True)
 class CertificateInfo:
     """Certificate validation information"""
     company_name_visible: bool = False
     certificate_is_valid_and_legible: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ApplicantCompliance:
     """Applicant compliance requirements"""
     msme_or_dipp_required: bool = False
     certificate_requirements: CertificateInfo = field(default_factory=CertificateInfo)
 
-@dataclass
+@dataclass(slots=True)
 class ApplicantDocuments:
     """Applicant document information"""
     msme_certificate: Optional[str] = None
     dipp_certificate: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class ApplicantInfo:
     """Complete applicant information"""
     applicant_type: ApplicantType
@@ -141,7 +149,7 @@ class ApplicantInfo:
     documents: ApplicantDocuments = field(default_factory=ApplicantDocuments)
     compliance: ApplicantCompliance = field(default_factory=ApplicantCompliance)
 
-@dataclass
+@dataclass(slots=True)
 class VerificationDocument:
     """Trademark verification document"""
     url: str
@@ -152,7 +160,7 @@ class VerificationDocument:
     extracted_text: str = ""
     clarity_score: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class TrademarkInfo:
     """Trademark information"""
     BrandName: str
@@ -161,13 +169,13 @@ class TrademarkInfo:
     AlreadyInUse: str  # "Yes" or "No"
     VerificationDocs: Dict[str, VerificationDocument] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class TrademarkData:
     """Complete trademark data"""
     TrademarkNos: int
     trademarks: Dict[str, TrademarkInfo] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class TrademarkValidationResult:
     """Trademark validation result"""
     is_valid: bool = True
@@ -1,6 +1,10 @@
 """
 Initialization file for the rules package
 """
+from datetime import datetime
+
+from dateutil import parser as _date_parser
+
 from .address_validation_rules import validate_address_match
 from .compliance_validation_rules import ComplianceValidationRules
 
@@ -10,19 +14,21 @@ def validate_name_match(name1, name2):
     result = ComplianceValidationRules.validate_name_match(name1, name2)
     return result['status'] == 'passed'
 
+def _parse_date(date_str):
+    """Parse a date, trying the fast ISO path before dateutil"""
+    try:
+        return datetime.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return _date_parser.parse(date_str)
+    except:
+        return None
+
 def validate_dob_match(dob1, dob2, tolerance_days=7):
     """Wrapper for date of birth matching"""
-    from datetime import datetime
-    from dateutil import parser
-
-    def parse_date(date_str):
-        try:
-            return parser.parse(date_str)
-        except:
-            return None
-
-    parsed_dob1 = parse_date(dob1)
-    parsed_dob2 = parse_date(dob2)
+    parsed_dob1 = _parse_date(dob1)
+    parsed_dob2 = _parse_date(dob2)
 
     if not (parsed_dob1 and parsed_dob2):
         return False
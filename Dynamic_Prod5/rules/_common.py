@@ -0,0 +1,149 @@
+"""
+Helpers shared by the rule modules
+
+Date parsing, name similarity and ASCII filter tables live here once, so
+every rule module shares the same compiled patterns and the same
+parse_date cache.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+from dateutil import parser
+from rapidfuzz.distance import Levenshtein
+
+# Each input shape maps to the strptime formats that can parse it, in the
+# order they used to be tried, so non-matching formats never raise
+_DATE_DISPATCH = (
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{1,4}'), ('%d/%m/%Y', '%m/%d/%Y')),  # DD/MM/YYYY, MM/DD/YYYY
+    (re.compile(r'\d{1,4}-\d{1,2}-\d{1,4}'), ('%Y-%m-%d', '%d-%m-%Y')),  # YYYY-MM-DD, DD-MM-YYYY
+    (re.compile(r'\d{1,2}\s+[A-Za-z]+\s+\d{1,4}'), ('%d %B %Y', '%d %b %Y')),  # DD Month YYYY, DD Mon YYYY
+)
+
+def ascii_filter_table(keep: str) -> Dict[int, None]:
+    """
+    Build a str.translate table deleting ASCII characters outside `keep`
+    
+    Whitespace is always kept so callers can still split on it. The table
+    only covers ASCII; callers fall back to their regex for other text.
+    
+    Args:
+        keep (str): Characters to keep
+    
+    Returns:
+        dict: Translate table mapping every other ASCII code point to None
+    """
+    return {
+        code: None
+        for code in range(128)
+        if chr(code) not in keep and not chr(code).isspace()
+    }
+
+@lru_cache(maxsize=1024)
+def parse_date(date_str: str) -> Union[datetime, None]:
+    """
+    Parse a date string in multiple formats
+    
+    Results are memoized: the same DOB/document dates are parsed repeatedly
+    across consistency checks, and datetime objects are immutable.
+    
+    Args:
+        date_str (str): Date string to parse
+    
+    Returns:
+        datetime or None: Parsed date
+    """
+    if not date_str:
+        return None
+    
+    # Only try the formats that fit the input's shape
+    if isinstance(date_str, str):
+        for pattern, formats in _DATE_DISPATCH:
+            if pattern.fullmatch(date_str):
+                for fmt in formats:
+                    try:
+                        return datetime.strptime(date_str, fmt)
+                    except ValueError:
+                        continue
+                break
+    
+    # Fallback to dateutil parser
+    try:
+        return parser.parse(date_str)
+    except (ValueError, TypeError):
+        return None
+
+def tokenize_name(name: str) -> Tuple[Dict[str, int], int]:
+    """
+    Tokenize a normalized name into a word -> bit map
+    
+    Each distinct word gets its own bit, so word-set intersection with
+    another name reduces to OR-ing bits and a popcount.
+    
+    Args:
+        name (str): Normalized name
+    
+    Returns:
+        tuple: (word -> bit map, total word count)
+    """
+    words = name.split()
+    word_bits = {}
+    for word in words:
+        if word not in word_bits:
+            word_bits[word] = 1 << len(word_bits)
+    return word_bits, len(words)
+
+def _word_overlap_ratio(name1_tokens: Tuple[Dict[str, int], int], name2: str) -> float:
+    """
+    Ratio of shared distinct words to the longer name's word count
+    
+    Args:
+        name1_tokens (tuple): First name tokenized by tokenize_name
+        name2 (str): Second normalized name
+    
+    Returns:
+        float: Common word ratio
+    """
+    word_bits, word_count1 = name1_tokens
+    words2 = name2.split()
+    
+    # Words missing from name1 contribute no bit
+    shared_mask = 0
+    for word in words2:
+        shared_mask |= word_bits.get(word, 0)
+    
+    return shared_mask.bit_count() / max(word_count1, len(words2))
+
+def name_similarity(
+    name1: str, 
+    name2: str, 
+    threshold: float = 0.8,
+    name1_tokens: Optional[Tuple[Dict[str, int], int]] = None
+) -> bool:
+    """
+    Calculate name similarity using advanced techniques
+    
+    Names match on shared-word ratio (order-insensitive) or on normalized
+    Levenshtein similarity, which tolerates OCR/typing errors such as
+    "parth" vs "parrth".
+    
+    Args:
+        name1 (str): First normalized name
+        name2 (str): Second normalized name
+        threshold (float): Similarity threshold
+        name1_tokens (tuple, optional): Pre-tokenized name1 from tokenize_name
+    
+    Returns:
+        bool: Whether names are similar
+    """
+    if _word_overlap_ratio(name1_tokens or tokenize_name(name1), name2) >= threshold:
+        return True
+    
+    # Edit distance is at least the length difference, so skip the DP
+    # entirely when that alone already puts the similarity below threshold
+    longest = max(len(name1), len(name2))
+    if longest and 1 - abs(len(name1) - len(name2)) / longest < threshold:
+        return False
+    
+    return Levenshtein.normalized_similarity(name1, name2) >= threshold
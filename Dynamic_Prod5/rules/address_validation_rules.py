@@ -1,6 +1,36 @@
 import re
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
 
+from ._common import ascii_filter_table
+from .document_fields import DocRecord, collect_extracted_fields, to_doc_records
+
+# Patterns compiled once at import for address normalization and matching
+# Each run of separator characters is matched once: runs containing
+# whitespace (captured in group 1) collapse to a single space, runs of pure
+# punctuation are dropped - the same result as stripping special characters
+# and then collapsing whitespace, in a single pass
+_RE_ADDR_NORM = re.compile(r'[^a-z0-9]*(\s)[^a-z0-9]*|[^a-z0-9]+')
+_RE_ADDR_MATCH_NORM = re.compile(r'\W*(\s)\W*|\W+')
+
+# ASCII fast path for the two normalizers: str.translate drops the same
+# characters in C and split/join collapses whitespace. The regexes above
+# still handle non-ASCII text, whose \s and \W are Unicode-aware.
+_ADDR_TABLE = ascii_filter_table('abcdefghijklmnopqrstuvwxyz0123456789')
+_ADDR_MATCH_TABLE = ascii_filter_table('abcdefghijklmnopqrstuvwxyz0123456789_')
+_RE_PIN = re.compile(r'\b\d{6}\b')
+_RE_STREET = re.compile(r'\b[a-z]+\s*(?:street|road|avenue|lane|society)\b')
+
+# Common location identifiers, matched as plain substrings. str's C substring
+# search beats both a regex alternation and re2/hyperscan bindings on
+# address-sized inputs, where per-call overhead dominates.
+_COMMON_KEYWORDS = ('flat', 'apartment', 'street', 'road', 'lane', 'block')
+
+def _space_or_empty(match: re.Match) -> str:
+    """Replacement for the normalization patterns above"""
+    return ' ' if match.group(1) else ''
+
+@lru_cache(maxsize=2048)
 def normalize_address(address: str) -> str:
     """
     Normalize an address for comparison
@@ -14,16 +44,11 @@ def normalize_address(address: str) -> str:
     if not address:
         return ''
     
-    # Convert to lowercase
-    normalized = address.lower().strip()
-    
-    # Remove special characters
-    normalized = re.sub(r'[^a-z0-9\s]', '', normalized)
-    
-    # Remove extra whitespaces
-    normalized = ' '.join(normalized.split())
-    
-    return normalized
+    # Lowercase, drop special characters and collapse whitespace
+    lowered = address.lower()
+    if lowered.isascii():
+        return ' '.join(lowered.translate(_ADDR_TABLE).split())
+    return _RE_ADDR_NORM.sub(_space_or_empty, lowered).strip()
 
 def validate_address_match(
     documents: Dict[str, Any], 
@@ -39,35 +64,28 @@ def validate_address_match(
     Returns:
         dict: Address validation results
     """
-    # Collect addresses from different sources
-    addresses = []
-    
-    # Extract electricity bill address
-    electricity_bill_address = None
-    for doc_key, doc_info in documents.items():
-        if isinstance(doc_info, dict) and doc_info.get('is_valid'):
-            extracted_data = doc_info.get('extracted_data', {})
-            bill_address = extracted_data.get('address')
-            if bill_address:
-                electricity_bill_address = bill_address
-                break
+    # Extract electricity bill address (first valid document that has one)
+    electricity_bill_address = next(
+        (
+            bill_address
+            for record in to_doc_records(documents)
+            if record.is_valid and (bill_address := record.extracted.get('address'))
+        ),
+        None
+    )
     
     # If no directors provided, use documents for address extraction
     if directors is None:
         directors = {}
     
-    # Collect director addresses
-    director_addresses = []
-    for director_key, director_info in directors.items():
-        # Check if director is authorised
-        if director_info.get('is_authorised', False):
-            # Look through director's documents
-            for doc_key, doc_info in director_info.get('documents', {}).items():
-                if isinstance(doc_info, dict) and doc_info.get('is_valid'):
-                    extracted_data = doc_info.get('extracted_data', {})
-                    dir_address = extracted_data.get('address')
-                    if dir_address:
-                        director_addresses.append(dir_address)
+    # Collect addresses from authorised directors' valid documents
+    director_addresses = [
+        dir_address
+        for director_info in directors.values()
+        if director_info.get('is_authorised', False)
+        for record in to_doc_records(director_info.get('documents', {}))
+        if record.is_valid and (dir_address := record.extracted.get('address'))
+    ]
     
     # If no electricity bill address found
     if not electricity_bill_address:
@@ -96,6 +114,23 @@ def validate_address_match(
         'error': 'Addresses do not match' if not is_consistent else None
     }
 
+@lru_cache(maxsize=2048)
+def _normalize_address_for_match(address: str) -> str:
+    """
+    Normalize an address for _addresses_match, keeping word characters
+    
+    Args:
+        address (str): Address to normalize
+    
+    Returns:
+        str: Normalized address
+    """
+    # Lowercase, drop special characters and collapse whitespace
+    lowered = address.lower()
+    if lowered.isascii():
+        return ' '.join(lowered.translate(_ADDR_MATCH_TABLE).split())
+    return _RE_ADDR_MATCH_NORM.sub(_space_or_empty, lowered).strip()
+
 def _addresses_match(address1: str, address2: str) -> bool:
     """
     Advanced address matching
@@ -110,40 +145,59 @@ def _addresses_match(address1: str, address2: str) -> bool:
     if not address1 or not address2:
         return False
     
-    # Normalize addresses
-    def normalize_address(address: str) -> str:
-        # Convert to lowercase
-        norm_addr = address.lower()
-        
-        # Remove special characters and extra whitespaces
-        norm_addr = re.sub(r'[^\w\s]', '', norm_addr)
-        norm_addr = re.sub(r'\s+', ' ', norm_addr).strip()
-        
-        return norm_addr
+    return _fingerprints_match(_address_fingerprint(address1), _address_fingerprint(address2))
+
+@lru_cache(maxsize=512)
+def _address_fingerprint(address: str) -> Tuple[str, Optional[str], Optional[str], FrozenSet[str]]:
+    """
+    Normalize an address and extract everything the matchers compare
     
-    norm_addr1 = normalize_address(address1)
-    norm_addr2 = normalize_address(address2)
+    Computed once per distinct address, so pairwise comparisons never
+    rerun the postal-code, street or keyword regexes.
     
-    # Exact substring match
-    if norm_addr1 in norm_addr2 or norm_addr2 in norm_addr1:
-        return True
+    Args:
+        address (str): Raw address
     
-    # Check for common location identifiers
-    common_keywords = ['flat', 'apartment', 'street', 'road', 'lane', 'block']
+    Returns:
+        tuple: (normalized address, postal code, street name, common keywords)
+    """
+    normalized = _normalize_address_for_match(address)
+    postal_code = _RE_PIN.search(normalized)
+    street = _RE_STREET.search(normalized)
+    return (
+        normalized,
+        postal_code.group() if postal_code else None,
+        street.group() if street else None,
+        frozenset([keyword for keyword in _COMMON_KEYWORDS if keyword in normalized])
+    )
+
+def _fingerprints_match(
+    fingerprint1: Tuple[str, Optional[str], Optional[str], FrozenSet[str]], 
+    fingerprint2: Tuple[str, Optional[str], Optional[str], FrozenSet[str]]
+) -> bool:
+    """
+    Match two addresses by their fingerprints
     
-    # Check if any common keywords match
-    for keyword in common_keywords:
-        if keyword in norm_addr1 and keyword in norm_addr2:
-            return True
+    Args:
+        fingerprint1 (tuple): First address fingerprint
+        fingerprint2 (tuple): Second address fingerprint
+    
+    Returns:
+        bool: Whether addresses match
+    """
+    norm_addr1, postal_code1, _, keywords1 = fingerprint1
+    norm_addr2, postal_code2, _, keywords2 = fingerprint2
     
-    # Extract and compare postal codes if present
-    postal_code1 = re.search(r'\b\d{6}\b', norm_addr1)
-    postal_code2 = re.search(r'\b\d{6}\b', norm_addr2)
+    # Exact substring match
+    if norm_addr1 in norm_addr2 or norm_addr2 in norm_addr1:
+        return True
     
-    if postal_code1 and postal_code2 and postal_code1.group() == postal_code2.group():
+    # Check if any common location identifiers appear in both addresses
+    if not keywords1.isdisjoint(keywords2):
         return True
     
-    return False
+    # Compare postal codes if present
+    return postal_code1 is not None and postal_code1 == postal_code2
 
 def _calculate_address_similarity(
     address1: str, 
@@ -161,58 +215,38 @@ def _calculate_address_similarity(
     Returns:
         bool: Whether addresses are similar
     """
-    # Extract key address components
-    def extract_components(address):
-        # Extract postal code
-        postal_code = re.search(r'\b\d{6}\b', address)
-        
-        # Extract street/area name
-        street = re.findall(r'\b[a-z]+\s*(?:street|road|avenue|lane|society)\b', address)
-        
-        return {
-            'postal_code': postal_code.group(0) if postal_code else None,
-            'street': street[0] if street else None
-        }
-    
-    # Compare address components
-    components1 = extract_components(address1)
-    components2 = extract_components(address2)
+    # Compare postal code and street/area name components
+    _, postal_code1, street1, _ = _address_fingerprint(address1)
+    _, postal_code2, street2, _ = _address_fingerprint(address2)
     
     # Check postal code match
-    postal_match = (
-        components1['postal_code'] and 
-        components1['postal_code'] == components2['postal_code']
-    )
+    postal_match = postal_code1 and postal_code1 == postal_code2
     
     # Check street name similarity
-    street_match = (
-        components1['street'] and 
-        components1['street'] == components2['street']
-    )
+    street_match = street1 and street1 == street2
     
     return postal_match or street_match
 
 def validate_address_consistency(
-    documents: Dict[str, Any]
+    documents: Union[Dict[str, Any], List[DocRecord]],
+    extracted_fields: Optional[Dict[str, List[Any]]] = None
 ) -> Dict[str, Any]:
     """
     Validate address consistency across documents
     
     Args:
-        documents (dict): Documents to check for address consistency
+        documents (dict or list): Documents to check for address consistency,
+            or DocRecords from to_doc_records
+        extracted_fields (dict, optional): Precomputed collect_extracted_fields(documents),
+            so callers running several consistency checks scan documents once
     
     Returns:
         dict: Address validation results
     """
     # Collect addresses from different documents
-    addresses = []
-    
-    for doc_key, doc_info in documents.items():
-        # Check if document is valid and has extracted data
-        if doc_info.get('is_valid') and doc_info.get('extracted_data'):
-            extracted_address = doc_info['extracted_data'].get('address')
-            if extracted_address:
-                addresses.append(extracted_address)
+    if extracted_fields is None:
+        extracted_fields = collect_extracted_fields(documents, ('address',))
+    addresses = extracted_fields['address']
     
     # Check address consistency
     if not addresses:
@@ -221,11 +255,12 @@ def validate_address_consistency(
             'error': 'No valid addresses found in documents'
         }
     
-    # Compare first address with others
-    first_address = addresses[0]
+    # Compare first address with others, fingerprinting each address once
+    fingerprints = [_address_fingerprint(address) for address in addresses]
+    first_fingerprint = fingerprints[0]
     is_consistent = all(
-        validate_address_match(first_address, address) 
-        for address in addresses[1:]
+        _fingerprints_match(first_fingerprint, fingerprint)
+        for fingerprint in fingerprints[1:]
     )
     
     return {
@@ -2,6 +2,18 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import re
 
+from ._common import ascii_filter_table, name_similarity, parse_date
+
+# Compiled once at import; strips everything but letters and whitespace
+_RE_NON_ALPHA_WS = re.compile(r'[^a-z\s]')
+_NAME_TABLE = ascii_filter_table('abcdefghijklmnopqrstuvwxyz')
+
+def _strip_non_alpha(text: str) -> str:
+    """Drop everything but letters and whitespace, via str.translate for ASCII"""
+    if text.isascii():
+        return text.translate(_NAME_TABLE)
+    return _RE_NON_ALPHA_WS.sub('', text)
+
 class ComplianceValidationRules:
     """
     Comprehensive compliance validation utility methods
@@ -70,35 +82,41 @@ class ComplianceValidationRules:
         Returns:
             dict: Matching result
         """
-        try:
-            # Normalize names
-            def normalize_name(name):
-                return re.sub(r'[^a-z\s]', '', name.lower().strip())
-            
-            norm_name1 = normalize_name(name1)
-            norm_name2 = normalize_name(name2)
-            
-            if strict:
-                # Exact match
-                is_match = norm_name1 == norm_name2
-            else:
-                # Fuzzy matching
-                is_match = (
-                    norm_name1 in norm_name2 or 
-                    norm_name2 in norm_name1 or
-                    ComplianceValidationRules._calculate_name_similarity(norm_name1, norm_name2)
-                )
-            
+        # Extracted values are not guaranteed to be strings
+        if not (isinstance(name1, str) and isinstance(name2, str)):
             return {
-                "status": "passed" if is_match else "failed",
-                "error_message": "Names do not match" if not is_match else None
+                "status": "failed",
+                "error_message": (
+                    f"Error in name matching: expected strings, got "
+                    f"{type(name1).__name__} and {type(name2).__name__}"
+                )
             }
         
-        except Exception as e:
+        if not (name1 and name2):
             return {
                 "status": "failed",
-                "error_message": f"Error in name matching: {str(e)}"
+                "error_message": "Name missing for comparison"
             }
+        
+        # Normalize names
+        norm_name1 = _strip_non_alpha(name1.lower().strip())
+        norm_name2 = _strip_non_alpha(name2.lower().strip())
+        
+        if strict:
+            # Exact match
+            is_match = norm_name1 == norm_name2
+        else:
+            # Fuzzy matching
+            is_match = (
+                norm_name1 in norm_name2 or 
+                norm_name2 in norm_name1 or
+                ComplianceValidationRules._calculate_name_similarity(norm_name1, norm_name2)
+            )
+        
+        return {
+            "status": "passed" if is_match else "failed",
+            "error_message": "Names do not match" if not is_match else None
+        }
     
     @staticmethod
     def validate_age(
@@ -129,8 +147,9 @@ class ComplianceValidationRules:
             
             # Calculate age
             today = datetime.now()
+            # Birthday not yet reached this year; month*100 + day orders like (month, day)
             age = today.year - parsed_dob.year - (
-                (today.month, today.day) < (parsed_dob.month, parsed_dob.day)
+                today.month * 100 + today.day < parsed_dob.month * 100 + parsed_dob.day
             )
             
             # Validate age
@@ -172,27 +191,26 @@ class ComplianceValidationRules:
         Returns:
             dict: Completeness validation result
         """
-        try:
-            missing_fields = [
-                field for field in required_fields 
-                if not document_data.get(field)
-            ]
-            
-            if missing_fields:
-                return {
-                    "status": "failed",
-                    "error_message": f"Missing fields: {', '.join(missing_fields)}"
-                }
-            
+        if document_data is None:
             return {
-                "status": "passed"
+                "status": "failed",
+                "error_message": "No document data to validate"
             }
         
-        except Exception as e:
+        missing_fields = [
+            field for field in required_fields 
+            if not document_data.get(field)
+        ]
+        
+        if missing_fields:
             return {
                 "status": "failed",
-                "error_message": f"Error validating document completeness: {str(e)}"
+                "error_message": f"Missing fields: {', '.join(missing_fields)}"
             }
+        
+        return {
+            "status": "passed"
+        }
     
     @staticmethod
     def _parse_date(date_str: str) -> Optional[datetime]:
@@ -205,32 +223,7 @@ class ComplianceValidationRules:
         Returns:
             datetime or None: Parsed date
         """
-        if not date_str:
-            return None
-        
-        # Date formats to try
-        date_formats = [
-            '%d/%m/%Y',  # DD/MM/YYYY
-            '%Y-%m-%d',  # YYYY-MM-DD
-            '%d-%m-%Y',  # DD-MM-YYYY
-            '%m/%d/%Y',  # MM/DD/YYYY
-            '%d %B %Y',  # DD Month YYYY
-            '%d %b %Y'   # DD Mon YYYY
-        ]
-        
-        # Try parsing with specific formats
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        # Fallback to dateutil parser
-        try:
-            from dateutil import parser
-            return parser.parse(date_str)
-        except (ValueError, TypeError):
-            return None
+        return parse_date(date_str)
     
     @staticmethod
     def _calculate_name_similarity(name1: str, name2: str, threshold: float = 0.8) -> bool:
@@ -245,15 +238,4 @@ class ComplianceValidationRules:
         Returns:
             bool: Whether names are similar
         """
-        # Split names into words
-        words1 = name1.split()
-        words2 = name2.split()
-        
-        # Check common word ratio
-        common_words = set(words1) & set(words2)
-        max_words = max(len(words1), len(words2))
-        
-        # Calculate similarity ratio
-        similarity_ratio = len(common_words) / max_words
-        
-        return similarity_ratio >= threshold
\ No newline at end of file
+        return name_similarity(name1, name2, threshold)
\ No newline at end of file
@@ -1,42 +1,7 @@
-from datetime import datetime
-from typing import Dict, Any, Union
-from dateutil import parser
+from typing import Dict, Any, List, Optional, Union
 
-def parse_date(date_str: str) -> Union[datetime, None]:
-    """
-    Parse a date string in multiple formats
-    
-    Args:
-        date_str (str): Date string to parse
-    
-    Returns:
-        datetime or None: Parsed date
-    """
-    if not date_str:
-        return None
-    
-    # Date formats to try
-    date_formats = [
-        '%d/%m/%Y',  # DD/MM/YYYY
-        '%Y-%m-%d',  # YYYY-MM-DD
-        '%d-%m-%Y',  # DD-MM-YYYY
-        '%m/%d/%Y',  # MM/DD/YYYY
-        '%d %B %Y',  # DD Month YYYY
-        '%d %b %Y'   # DD Mon YYYY
-    ]
-    
-    # Try parsing with specific formats
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    
-    # Fallback to dateutil parser
-    try:
-        return parser.parse(date_str)
-    except (ValueError, TypeError):
-        return None
+from ._common import parse_date
+from .document_fields import DocRecord, collect_extracted_fields
 
 def validate_date_match(
     date1: str, 
@@ -68,28 +33,26 @@ def validate_date_match(
     return date_diff <= tolerance_days
 
 def validate_dob_consistency(
-    documents: Dict[str, Any],
-    tolerance_days: int = 7
+    documents: Union[Dict[str, Any], List[DocRecord]],
+    tolerance_days: int = 7,
+    extracted_fields: Optional[Dict[str, List[Any]]] = None
 ) -> Dict[str, Any]:
     """
     Validate Date of Birth consistency across documents
     
     Args:
-        documents (dict): Documents to check for DOB consistency
+        documents (dict or list): Documents to check for DOB consistency,
+            or DocRecords from to_doc_records
         tolerance_days (int): Allowed difference in days
+        extracted_fields (dict, optional): Precomputed collect_extracted_fields(documents)
     
     Returns:
         dict: DOB validation results
     """
     # Collect dates of birth from different documents
-    dobs = []
-    
-    for doc_key, doc_info in documents.items():
-        # Check if document is valid and has extracted data
-        if doc_info.get('is_valid') and doc_info.get('extracted_data'):
-            extracted_dob = doc_info['extracted_data'].get('dob')
-            if extracted_dob:
-                dobs.append(extracted_dob)
+    if extracted_fields is None:
+        extracted_fields = collect_extracted_fields(documents, ('dob',))
+    dobs = extracted_fields['dob']
     
     # Check DOB consistency
     if not dobs:
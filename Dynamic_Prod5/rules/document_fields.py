@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Union
+
+# Fields compared by the address, name and DOB consistency validators
+CONSISTENCY_FIELDS = ('address', 'name', 'dob')
+
+@dataclass(slots=True)
+class DocRecord:
+    """Processed document reduced to what the consistency validators read"""
+    is_valid: bool
+    extracted: Dict[str, Any]
+
+def to_doc_records(documents: Dict[str, Any]) -> List[DocRecord]:
+    """
+    Normalize processed documents into DocRecords once
+    
+    Non-dict documents are dropped and non-dict extracted data becomes an
+    empty dict here, so validators can use attribute access without
+    re-checking types on every document.
+    
+    Args:
+        documents (dict): Documents keyed by document id
+    
+    Returns:
+        list: DocRecords in document order
+    """
+    records = []
+    for doc_info in documents.values():
+        if not isinstance(doc_info, dict):
+            continue
+        extracted_data = doc_info.get('extracted_data')
+        records.append(DocRecord(
+            is_valid=bool(doc_info.get('is_valid')),
+            extracted=extracted_data if isinstance(extracted_data, dict) else {}
+        ))
+    return records
+
+def collect_extracted_fields(
+    documents: Union[Dict[str, Any], List[DocRecord]],
+    fields: Iterable[str] = CONSISTENCY_FIELDS
+) -> Dict[str, List[Any]]:
+    """
+    Collect extracted field values from valid documents in a single pass
+    
+    Args:
+        documents (dict or list): Documents keyed by document id, or
+            DocRecords already built by to_doc_records
+        fields (iterable): Extracted-data fields to collect
+    
+    Returns:
+        dict: Field name -> list of non-empty values, in document order
+    """
+    if isinstance(documents, dict):
+        documents = to_doc_records(documents)
+    
+    collected = {field: [] for field in fields}
+    
+    for record in documents:
+        # Only valid documents with extracted data contribute
+        if not (record.is_valid and record.extracted):
+            continue
+        
+        for field, values in collected.items():
+            value = record.extracted.get(field)
+            if value:
+                values.append(value)
+    
+    return collected
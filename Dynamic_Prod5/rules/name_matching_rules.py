@@ -1,6 +1,24 @@
 import re
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 
+from ._common import ascii_filter_table, name_similarity, tokenize_name
+from .document_fields import DocRecord, collect_extracted_fields
+
+# Compiled once at import. Each run of non-letters is matched once: runs
+# containing whitespace (group 1) collapse to a single space, the rest are
+# dropped - stripping special characters and collapsing whitespace in one pass
+_RE_NAME_NORM = re.compile(r'[^a-z]*(\s)[^a-z]*|[^a-z]+')
+
+# ASCII fast path: str.translate drops the same characters in C; the regex
+# above still handles non-ASCII names
+_NAME_TABLE = ascii_filter_table('abcdefghijklmnopqrstuvwxyz')
+
+def _space_or_empty(match: re.Match) -> str:
+    """Replacement for _RE_NAME_NORM"""
+    return ' ' if match.group(1) else ''
+
+@lru_cache(maxsize=2048)
 def normalize_name(name: str) -> str:
     """
     Normalize a name for comparison
@@ -14,16 +32,11 @@ def normalize_name(name: str) -> str:
     if not name:
         return ''
     
-    # Convert to lowercase
-    normalized = name.lower().strip()
-    
-    # Remove special characters
-    normalized = re.sub(r'[^a-z\s]', '', normalized)
-    
-    # Remove extra whitespaces
-    normalized = ' '.join(normalized.split())
-    
-    return normalized
+    # Lowercase, drop special characters and collapse whitespace
+    lowered = name.lower()
+    if lowered.isascii():
+        return ' '.join(lowered.translate(_NAME_TABLE).split())
+    return _RE_NAME_NORM.sub(_space_or_empty, lowered).strip()
 
 def check_name_match(
     name1: str, 
@@ -42,9 +55,26 @@ def check_name_match(
         bool: Whether names match
     """
     # Normalize names
-    norm_name1 = normalize_name(name1)
-    norm_name2 = normalize_name(name2)
+    return _normalized_names_match(normalize_name(name1), normalize_name(name2), strict)
+
+def _normalized_names_match(
+    norm_name1: str, 
+    norm_name2: str, 
+    strict: bool = False,
+    name1_tokens: Optional[Tuple[Dict[str, int], int]] = None
+) -> bool:
+    """
+    Compare two already-normalized names
     
+    Args:
+        norm_name1 (str): First normalized name
+        norm_name2 (str): Second normalized name
+        strict (bool): Whether to use strict matching
+        name1_tokens (tuple, optional): Pre-tokenized norm_name1 from tokenize_name
+    
+    Returns:
+        bool: Whether names match
+    """
     if strict:
         # Exact match
         return norm_name1 == norm_name2
@@ -54,56 +84,29 @@ def check_name_match(
     return (
         norm_name1 in norm_name2 or 
         norm_name2 in norm_name1 or
-        # Levenshtein distance could be added here for more advanced matching
-        _calculate_name_similarity(norm_name1, norm_name2)
+        # Levenshtein distance catches typos the word overlap misses
+        name_similarity(norm_name1, norm_name2, name1_tokens=name1_tokens)
     )
 
-def _calculate_name_similarity(name1: str, name2: str, threshold: float = 0.8) -> bool:
-    """
-    Calculate name similarity using advanced techniques
-    
-    Args:
-        name1 (str): First normalized name
-        name2 (str): Second normalized name
-        threshold (float): Similarity threshold
-    
-    Returns:
-        bool: Whether names are similar
-    """
-    # Split names into words
-    words1 = name1.split()
-    words2 = name2.split()
-    
-    # Check common word ratio
-    common_words = set(words1) & set(words2)
-    max_words = max(len(words1), len(words2))
-    
-    # Calculate similarity ratio
-    similarity_ratio = len(common_words) / max_words
-    
-    return similarity_ratio >= threshold
-
 def validate_name_consistency(
-    documents: Dict[str, Any]
+    documents: Union[Dict[str, Any], List[DocRecord]],
+    extracted_fields: Optional[Dict[str, List[Any]]] = None
 ) -> Dict[str, Any]:
     """
     Validate name consistency across documents
     
     Args:
-        documents (dict): Documents to check for name consistency
+        documents (dict or list): Documents to check for name consistency,
+            or DocRecords from to_doc_records
+        extracted_fields (dict, optional): Precomputed collect_extracted_fields(documents)
     
     Returns:
         dict: Name validation results
     """
     # Collect names from different documents
-    names = []
-    
-    for doc_key, doc_info in documents.items():
-        # Check if document is valid and has extracted data
-        if doc_info.get('is_valid') and doc_info.get('extracted_data'):
-            extracted_name = doc_info['extracted_data'].get('name')
-            if extracted_name:
-                names.append(extracted_name)
+    if extracted_fields is None:
+        extracted_fields = collect_extracted_fields(documents, ('name',))
+    names = extracted_fields['name']
     
     # Check name consistency
     if not names:
@@ -112,10 +115,11 @@ def validate_name_consistency(
             'error': 'No valid names found in documents'
         }
     
-    # Compare first name with others
-    first_name = names[0]
+    # Compare first name with others, normalizing and tokenizing it only once
+    norm_first_name = normalize_name(names[0])
+    first_name_tokens = tokenize_name(norm_first_name)
     is_consistent = all(
-        check_name_match(first_name, name) 
+        _normalized_names_match(norm_first_name, normalize_name(name), name1_tokens=first_name_tokens)
         for name in names[1:]
     )
     
@@ -1,11 +1,53 @@
+import copy
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Any, Optional, Tuple, Union
 
 from utils.file_utils import DocumentDownloader, APIDocumentFetcher
 from services.extraction_service import ExtractionService
-from models.document_models import DocumentType, NationalityType
+from models.document_models import DocumentType, NationalityType, ProcessedDocument
 from config.settings import Config
 
+# Extraction results are reused for repeated (URL, document type) pairs.
+# Entries expire because content behind signed/shared URLs can change.
+_EXTRACTION_CACHE_SIZE = 4096
+_EXTRACTION_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Director documents processed for every director, in result order
+_REQUIRED_DOCS = (
+    'adhereCardFront', 
+    'adhereCardBack', 
+    'passportPhoto', 
+    'address_proof'
+)
+
+# Foreign directors have no Aadhaar, so only their passport photo and address
+# proof are extracted; unknown nationalities get the full set
+_REQUIRED_DOCS_BY_NATIONALITY = {
+    'Indian': _REQUIRED_DOCS,
+    'Foreign': ('passportPhoto', 'address_proof'),
+}
+
+# Document key -> document type passed to the extraction service
+_DOC_TYPE_MAP = {
+    'adhereCardFront': 'aadhar',
+    'adhereCardBack': 'aadhar',
+    'passportPhoto': 'passport',
+    'address_proof': 'address_proof'
+}
+
+# A submitted director document: error details, or the batch future that
+# extracts it plus the document key it is filed under in that batch's result
+_PendingDoc = Union[Dict[str, Any], Tuple[Future, str]]
+
+# Accepted values for a director's 'nationality' field
+_VALID_NATIONALITIES = frozenset(nationality.value for nationality in NationalityType)
+
 class DocumentProcessor:
     """
     Comprehensive document processing service
@@ -38,6 +80,22 @@ class DocumentProcessor:
         # API credentials
         self.api_key = api_key
         self.api_token = api_token
+        
+        # Shared pool for document downloads/extractions, which are I/O bound
+        self._doc_pool = ThreadPoolExecutor(
+            max_workers=Config.DOC_WORKERS,
+            thread_name_prefix="doc"
+        )
+        
+        # (sha256(url), doc_type) -> (expiry timestamp, extracted data), LRU ordered
+        self._extraction_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._extraction_cache_lock = threading.Lock()
+        # Extractions currently running, so concurrent duplicates wait instead
+        self._extraction_in_flight: Dict[Tuple[str, str], Future] = {}
+    
+    def close(self):
+        """Shut down the document worker pool"""
+        self._doc_pool.shutdown(wait=True)
     
     def process_director_documents(
         self, 
@@ -52,31 +110,89 @@ class DocumentProcessor:
         Returns:
             dict: Processed and validated director documents
         """
+        # Start every director's document extractions up front so they all
+        # share the pool, then assemble each director as its documents finish
+        pending_documents, processed_directors = self._submit_all_director_documents(directors_data)
+        return self._assemble_directors(directors_data, pending_documents, processed_directors)
+    
+    def _submit_all_director_documents(
+        self, 
+        directors_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, _PendingDoc]], Dict[str, Dict[str, Any]]]:
+        """
+        Submit every director's document set to the pool
+        
+        Args:
+            directors_data (dict): Director document information
+        
+        Returns:
+            tuple: (director key -> pending documents, director key -> error
+                details for directors whose documents could not be submitted)
+        """
+        pending_documents = {}
         processed_directors = {}
+        # (url, doc_type) already submitted in this call, shared across directors
+        submitted_docs = {}
         
         for director_key, director_info in directors_data.items():
-            try:
-                # Validate and process individual director
-                processed_director = self._process_single_director(director_info)
-                processed_directors[director_key] = processed_director
-            
-            except Exception as e:
-                self.logger.error(f"Error processing director {director_key}: {e}")
+            # Malformed input is an ordinary failure; check it up front
+            documents = director_info.get('documents', {}) if isinstance(director_info, dict) else None
+            if not isinstance(documents, dict):
+                error = f"Invalid director data for {director_key}"
+                self.logger.error("Error processing director %s: %s", director_key, error)
                 processed_directors[director_key] = {
-                    'error': str(e)
+                    'error': error
                 }
+                continue
+            
+            pending_documents[director_key] = self._submit_director_document_set(
+                documents,
+                submitted_docs,
+                self._get_required_docs(director_info.get('nationality'))
+            )
+        
+        return pending_documents, processed_directors
+    
+    def _assemble_directors(
+        self, 
+        directors_data: Dict[str, Dict[str, Any]],
+        pending_documents: Dict[str, Dict[str, _PendingDoc]],
+        processed_directors: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build each director's result from its submitted documents
         
-        return processed_directors
+        Args:
+            directors_data (dict): Director document information
+            pending_documents (dict): Pending documents from _submit_all_director_documents
+            processed_directors (dict): Directors that already failed submission
+        
+        Returns:
+            dict: Processed and validated director documents, in input order
+        """
+        # Validate and process each director in input order; document
+        # extraction failures are already captured per document
+        return {
+            director_key: (
+                self._process_single_director(director_info, pending_documents[director_key])
+                if director_key in pending_documents
+                else processed_directors[director_key]
+            )
+            for director_key, director_info in directors_data.items()
+        }
     
     def _process_single_director(
         self, 
-        director_info: Dict[str, Any]
+        director_info: Dict[str, Any],
+        pending_documents: Optional[Dict[str, _PendingDoc]] = None
     ) -> Dict[str, Any]:
         """
         Process documents for a single director
         
         Args:
             director_info (dict): Director document information
+            pending_documents (dict, optional): Result of _submit_director_document_set
+                for this director's documents, if already started
         
         Returns:
             dict: Processed director document details
@@ -92,8 +208,12 @@ class DocumentProcessor:
         )
         
         # Process individual documents
-        documents = director_info.get('documents', {})
-        processed_documents = self._process_director_document_set(documents)
+        if pending_documents is None:
+            pending_documents = self._submit_director_document_set(
+                director_info.get('documents', {}),
+                required_docs=_REQUIRED_DOCS_BY_NATIONALITY.get(nationality, _REQUIRED_DOCS)
+            )
+        processed_documents = self._collect_document_set(pending_documents)
         
         return {
             'nationality': nationality,
@@ -103,69 +223,171 @@ class DocumentProcessor:
     
     def _process_director_document_set(
         self, 
-        documents: Dict[str, str]
+        documents: Dict[str, str],
+        required_docs: Tuple[str, ...] = _REQUIRED_DOCS
     ) -> Dict[str, Dict[str, Any]]:
         """
         Process and validate a set of director documents
         
         Args:
             documents (dict): Document URLs
+            required_docs (tuple): Document keys to process
         
         Returns:
             dict: Processed document details
         """
-        processed_docs = {}
+        return self._collect_document_set(
+            self._submit_director_document_set(documents, required_docs=required_docs)
+        )
+    
+    def _submit_director_document_set(
+        self, 
+        documents: Dict[str, str],
+        submitted_docs: Optional[Dict[Tuple[str, str], Tuple[Future, str]]] = None,
+        required_docs: Tuple[str, ...] = _REQUIRED_DOCS
+    ) -> Dict[str, _PendingDoc]:
+        """
+        Start extraction of the required director documents on the pool
         
-        # Define required document types
-        required_docs = [
-            'adhereCardFront', 
-            'adhereCardBack', 
-            'passportPhoto', 
-            'address_proof'
-        ]
+        All valid documents of the set are extracted by one batched task,
+        so a director costs a single AI request instead of one per document.
+        A (URL, document type) pair already submitted - earlier in this set
+        or, via submitted_docs, for another director - reuses that extraction.
+        
+        Args:
+            documents (dict): Document URLs
+            submitted_docs (dict, optional): (url, doc_type) -> pending entry,
+                shared across the directors of one call and updated in place
+            required_docs (tuple): Document keys to process
+        
+        Returns:
+            dict: Document key -> error details, or (batch future, document
+                key within that batch's result)
+        """
+        if submitted_docs is None:
+            submitted_docs = {}
+        pending_docs = {}
+        batch_urls = {}
+        # (url, doc_type) -> document key it is extracted under in this set's batch
+        batch_keys = {}
         
         for doc_key in required_docs:
-            try:
-                # Get document URL
-                doc_url = documents.get(doc_key)
-                
-                if not doc_url:
-                    processed_docs[doc_key] = {
-                        'error': f'Missing document: {doc_key}'
-                    }
-                    continue
-                
-                # Validate document URL
-                if not self._validate_document_url(doc_url):
-                    processed_docs[doc_key] = {
-                        'error': f'Invalid document URL: {doc_url}'
-                    }
-                    continue
-                
-                # Determine document type
-                doc_type = self._get_document_type(doc_key)
-                
-                # Extract document data
-                extracted_data = self.extraction_service.extract_document_data(
-                    doc_url, 
-                    doc_type
-                )
-                
-                processed_docs[doc_key] = {
-                    'url': doc_url,
-                    'document_type': doc_type,
-                    'is_valid': True,
-                    'extracted_data': extracted_data
+            # Get document URL
+            doc_url = documents.get(doc_key)
+            
+            if not doc_url:
+                pending_docs[doc_key] = {
+                    'error': f'Missing document: {doc_key}'
                 }
+                continue
+            
+            # Validate document URL
+            if not self._validate_document_url(doc_url):
+                pending_docs[doc_key] = {
+                    'error': f'Invalid document URL: {doc_url}'
+                }
+                continue
+            
+            # Reuse an extraction of the same document submitted for another director
+            submitted_key = (doc_url, self._get_document_type(doc_key))
+            if submitted_key in submitted_docs:
+                pending_docs[doc_key] = submitted_docs[submitted_key]
+                continue
+            
+            # Within the set, repeats ride on the first key's batch entry
+            batch_key = batch_keys.setdefault(submitted_key, doc_key)
+            if batch_key == doc_key:
+                batch_urls[doc_key] = doc_url
+            pending_docs[doc_key] = batch_key
+        
+        if batch_urls:
+            batch_future = self._doc_pool.submit(self._process_document_batch, batch_urls)
+            for submitted_key, batch_key in batch_keys.items():
+                submitted_docs[submitted_key] = (batch_future, batch_key)
+            for doc_key, pending in pending_docs.items():
+                if isinstance(pending, str):
+                    pending_docs[doc_key] = (batch_future, pending)
+        
+        return pending_docs
+    
+    def _collect_document_set(
+        self, 
+        pending_docs: Dict[str, _PendingDoc]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for submitted documents, keeping the required-document order
+        
+        Args:
+            pending_docs (dict): Result of _submit_director_document_set
+        
+        Returns:
+            dict: Processed document details
+        """
+        processed_docs = {}
+        
+        for doc_key, pending in pending_docs.items():
+            if not isinstance(pending, tuple):
+                processed_docs[doc_key] = pending
+                continue
             
+            batch_future, batch_key = pending
+            try:
+                # asdict copies the extracted data too, which matters because
+                # duplicate documents share one batch entry
+                processed_docs[doc_key] = asdict(batch_future.result()[batch_key])
             except Exception as e:
-                self.logger.error(f"Error processing document {doc_key}: {e}")
+                self.logger.error("Error processing document %s: %s", doc_key, e)
                 processed_docs[doc_key] = {
                     'error': str(e)
                 }
         
         return processed_docs
     
+    def _process_document_batch(
+        self, 
+        doc_urls: Dict[str, str]
+    ) -> Dict[str, ProcessedDocument]:
+        """
+        Extract a director's validated documents in one request (runs on the pool)
+        
+        Documents already in the extraction cache are not sent again.
+        
+        Args:
+            doc_urls (dict): Document key -> validated document URL
+        
+        Returns:
+            dict: Document key -> ProcessedDocument
+        """
+        doc_types = {doc_key: self._get_document_type(doc_key) for doc_key in doc_urls}
+        extracted = {}
+        uncached_urls = {}
+        
+        for doc_key, doc_url in doc_urls.items():
+            cached = self._cache_get(doc_url, doc_types[doc_key])
+            if cached is None:
+                uncached_urls[doc_key] = doc_url
+            else:
+                extracted[doc_key] = cached
+        
+        if uncached_urls:
+            batch_results = self.extraction_service.extract_document_batch(
+                uncached_urls,
+                {doc_key: doc_types[doc_key] for doc_key in uncached_urls}
+            )
+            for doc_key, extracted_data in batch_results.items():
+                self._cache_put(uncached_urls[doc_key], doc_types[doc_key], extracted_data)
+                extracted[doc_key] = extracted_data
+        
+        return {
+            doc_key: ProcessedDocument(
+                url=doc_url,
+                document_type=doc_types[doc_key],
+                is_valid=True,
+                extracted_data=extracted[doc_key]
+            )
+            for doc_key, doc_url in doc_urls.items()
+        }
+    
     def process_company_documents(
         self, 
         company_docs: Dict[str, Any]
@@ -198,10 +420,7 @@ class DocumentProcessor:
                 }
             
             # Extract document data
-            extracted_data = self.extraction_service.extract_document_data(
-                address_proof_url, 
-                'address_proof'
-            )
+            extracted_data = self._extract_cached(address_proof_url, 'address_proof')
             
             return {
                 'address_proof_type': address_proof_type,
@@ -213,11 +432,123 @@ class DocumentProcessor:
             }
         
         except Exception as e:
-            self.logger.error(f"Error processing company documents: {e}")
+            self.logger.error("Error processing company documents: %s", e)
             return {
                 'error': str(e)
             }
     
+    def _extract_cached(self, doc_url: str, doc_type: str) -> Any:
+        """
+        Extract document data, reusing earlier results for the same URL
+        
+        Concurrent requests for the same document share one extraction.
+        Callers get a copy, so mutating it never alters the cache.
+        
+        Args:
+            doc_url (str): Document URL
+            doc_type (str): Document type
+        
+        Returns:
+            Extracted document data
+        """
+        cache_key = self._cache_key(doc_url, doc_type)
+        
+        with self._extraction_cache_lock:
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
+            
+            in_flight = self._extraction_in_flight.get(cache_key)
+            if in_flight is None:
+                in_flight = self._extraction_in_flight[cache_key] = Future()
+                is_owner = True
+            else:
+                is_owner = False
+        
+        if not is_owner:
+            return copy.deepcopy(in_flight.result())
+        
+        try:
+            extracted_data = self.extraction_service.extract_document_data(doc_url, doc_type)
+        except BaseException as e:
+            with self._extraction_cache_lock:
+                del self._extraction_in_flight[cache_key]
+            in_flight.set_exception(e)
+            raise
+        
+        with self._extraction_cache_lock:
+            del self._extraction_in_flight[cache_key]
+        self._cache_put(doc_url, doc_type, extracted_data)
+        in_flight.set_result(extracted_data)
+        
+        return copy.deepcopy(extracted_data)
+    
+    @staticmethod
+    def _cache_key(doc_url: str, doc_type: str) -> Tuple[str, str]:
+        """Extraction cache key for a document"""
+        return hashlib.sha256(doc_url.encode()).hexdigest(), doc_type
+    
+    def _cache_lookup(self, cache_key: Tuple[str, str]) -> Any:
+        """
+        Return a copy of a live cache entry, or None (caller holds the lock)
+        
+        Args:
+            cache_key (tuple): Result of _cache_key
+        
+        Returns:
+            Cached extracted data, or None on a miss
+        """
+        cached = self._extraction_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        expires_at, extracted_data = cached
+        if expires_at <= time.monotonic():
+            del self._extraction_cache[cache_key]
+            return None
+        
+        self._extraction_cache.move_to_end(cache_key)
+        return copy.deepcopy(extracted_data)
+    
+    def _cache_get(self, doc_url: str, doc_type: str) -> Any:
+        """
+        Look up a cached extraction result
+        
+        Args:
+            doc_url (str): Document URL
+            doc_type (str): Document type
+        
+        Returns:
+            A copy of the cached extracted data, or None on a miss
+        """
+        with self._extraction_cache_lock:
+            return self._cache_lookup(self._cache_key(doc_url, doc_type))
+    
+    def _cache_put(self, doc_url: str, doc_type: str, extracted_data: Any):
+        """
+        Cache an extraction result, unless the extraction failed
+        
+        Failed extractions are not cached so transient download/API errors
+        are retried.
+        
+        Args:
+            doc_url (str): Document URL
+            doc_type (str): Document type
+            extracted_data: Extraction result
+        """
+        if isinstance(extracted_data, dict) and extracted_data.get('extraction_status') == 'failed':
+            return
+        
+        cache_key = self._cache_key(doc_url, doc_type)
+        with self._extraction_cache_lock:
+            self._extraction_cache[cache_key] = (
+                time.monotonic() + _EXTRACTION_CACHE_TTL_SECONDS,
+                copy.deepcopy(extracted_data)
+            )
+            self._extraction_cache.move_to_end(cache_key)
+            if len(self._extraction_cache) > _EXTRACTION_CACHE_SIZE:
+                self._extraction_cache.popitem(last=False)
+    
     def _validate_nationality(self, nationality: str) -> str:
         """
         Validate director nationality
@@ -228,11 +559,12 @@ class DocumentProcessor:
         Returns:
             str: Validated nationality
         """
-        try:
-            return NationalityType(nationality.strip()).value
-        except ValueError:
-            self.logger.warning(f"Invalid nationality: {nationality}")
-            return 'Unknown'
+        parsed_nationality = nationality.strip() if isinstance(nationality, str) else None
+        if parsed_nationality in _VALID_NATIONALITIES:
+            return parsed_nationality
+        
+        self.logger.warning("Invalid nationality: %s", nationality)
+        return 'Unknown'
     
     def _validate_authorization(self, authorisation: str) -> bool:
         """
@@ -244,20 +576,13 @@ class DocumentProcessor:
         Returns:
             bool: Validated authorization status
         """
-        valid_authorizations = {'Yes', 'No'}
-        
-        try:
-            parsed_auth = authorisation.strip().capitalize()
-            
-            if parsed_auth not in valid_authorizations:
-                self.logger.warning(f"Invalid authorization status: {authorisation}")
-                return False
-            
-            return parsed_auth == 'Yes'
+        parsed_auth = authorisation.strip().lower() if isinstance(authorisation, str) else None
         
-        except Exception:
-            self.logger.warning(f"Invalid authorization status: {authorisation}")
-            return False
+        if parsed_auth == 'yes':
+            return True
+        if parsed_auth != 'no':
+            self.logger.warning("Invalid authorization status: %s", authorisation)
+        return False
     
     def _validate_document_url(self, url: str) -> bool:
         """
@@ -271,6 +596,20 @@ class DocumentProcessor:
         """
         return DocumentDownloader.validate_url(url)
     
+    def _get_required_docs(self, nationality: Any) -> Tuple[str, ...]:
+        """
+        Document keys to process for a director's raw nationality value
+        
+        Args:
+            nationality: Nationality as given in the input
+        
+        Returns:
+            tuple: Required document keys
+        """
+        if not isinstance(nationality, str):
+            return _REQUIRED_DOCS
+        return _REQUIRED_DOCS_BY_NATIONALITY.get(nationality.strip(), _REQUIRED_DOCS)
+    
     def _get_document_type(self, doc_key: str) -> str:
         """
         Determine document type from document key
@@ -281,11 +620,4 @@ class DocumentProcessor:
         Returns:
             str: Detected document type
         """
-        doc_type_mapping = {
-            'adhereCardFront': 'aadhar',
-            'adhereCardBack': 'aadhar',
-            'passportPhoto': 'passport',
-            'address_proof': 'address_proof'
-        }
-        
-        return doc_type_mapping.get(doc_key, 'unknown')
\ No newline at end of file
+        return _DOC_TYPE_MAP.get(doc_key, 'unknown')
\ No newline at end of file
@@ -2,6 +2,22 @@
 Updated extraction prompts for different document types to support
 the new validation requirements
 """
+import re
+
+import fastjsonschema
+
+# Leading indentation and blank lines, which only exist for source readability
+_RE_PROMPT_INDENT = re.compile(r'^[ \t]+', re.MULTILINE)
+_RE_PROMPT_BLANK_LINES = re.compile(r'\n{2,}')
+
+def _compact_prompt(prompt):
+    """
+    Strip indentation and blank lines from a prompt before it is sent
+    
+    Every character is billed as input tokens on each extraction call.
+    """
+    prompt = _RE_PROMPT_INDENT.sub('', prompt)
+    return _RE_PROMPT_BLANK_LINES.sub('\n', prompt).strip()
 
 def get_aadhar_extraction_prompt():
     """
@@ -579,3 +595,69 @@ def get_rental_agreement_extraction_prompt():
 
     If a field is not found, use null.
     """
+
+# Compacted prompt for each document type, built once at import. Keys are
+# lowercase document types; anything else falls back to GENERIC_EXTRACTION_PROMPT.
+_PROMPT_BUILDERS = {
+    'aadhar': get_aadhar_extraction_prompt(),
+    'pan': get_pan_extraction_prompt(),
+    'passport': get_passport_extraction_prompt(),
+    'passport_photo': get_passport_photo_extraction_prompt(),
+    'address_proof': get_address_proof_extraction_prompt(),
+    'electricity_bill': get_bill_extraction_prompt(),
+    'elec_bill': get_elec_bill_extraction_prompt(),
+    'signature': get_signature_extraction_prompt(),
+    'driving_license': get_driving_license_extraction_prompt(),
+    'noc': get_noc_extraction_prompt(),
+    'consent_letter': get_consent_letter_extraction_prompt(),
+    'board_resolution': get_board_resolution_extraction_prompt(),
+    'msme_certificate': get_msme_certificate_extraction_prompt(),
+    'dipp_certificate': get_dipp_certificate_extraction_prompt(),
+    'trademark_verification': get_trademark_verification_document_prompt(),
+    'rental_agreement': get_rental_agreement_extraction_prompt()
+}
+
+# Document types that share another type's prompt
+_PROMPT_ALIASES = {
+    'aadhar_front': 'aadhar',
+    'aadhar_back': 'aadhar',
+}
+
+EXTRACTION_PROMPTS = {
+    document_type: _compact_prompt(prompt)
+    for document_type, prompt in _PROMPT_BUILDERS.items()
+}
+EXTRACTION_PROMPTS.update(
+    (alias, EXTRACTION_PROMPTS[document_type])
+    for alias, document_type in _PROMPT_ALIASES.items()
+)
+
+GENERIC_EXTRACTION_PROMPT = _compact_prompt(get_generic_extraction_prompt())
+
+# Required shape of the JSON returned for document types that are verified
+# after extraction: each listed field must be present and truthy, matching
+# the `if not data.get(field)` checks these schemas replace.
+_NON_EMPTY = {"not": {"enum": [None, "", 0, False, [], {}]}}
+
+def _required_fields_schema(fields, **extra_properties):
+    """Object schema requiring each field to be present and non-empty"""
+    properties = {field: _NON_EMPTY for field in fields}
+    for field, schema in extra_properties.items():
+        properties[field] = {"allOf": [_NON_EMPTY, schema]}
+    return {"type": "object", "required": list(fields), "properties": properties}
+
+RESPONSE_SCHEMAS = {
+    'aadhar': _required_fields_schema(('name', 'aadhar_number', 'address')),
+    'pan': _required_fields_schema(
+        ('name', 'pan_number', 'dob'),
+        pan_number={"type": "string", "pattern": r'^[A-Z]{5}\d{4}[A-Z]{1}$'}
+    ),
+    'passport': _required_fields_schema(('name', 'passport_number', 'dob', 'expiry_date')),
+}
+
+# Validators generated once at import; each raises
+# fastjsonschema.JsonSchemaValueException for a non-conforming response
+RESPONSE_VALIDATORS = {
+    document_type: fastjsonschema.compile(schema)
+    for document_type, schema in RESPONSE_SCHEMAS.items()
+}
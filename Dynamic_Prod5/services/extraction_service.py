@@ -1,65 +1,178 @@
 import os
 import re
-import json
 import logging
 import base64
 import io
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
-from PIL import Image, ImageEnhance, ImageOps
-import cv2
+from functools import lru_cache
+from typing import Dict, Any, Optional, Union
+from PIL import Image, ImageOps
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import openai
 from PIL import Image
-import PyPDF2
-from pdf2image import convert_from_bytes
 import numpy as np
+import orjson
+import fastjsonschema
+
+# Optional: libvips downscales large non-JPEG images faster and in bounded memory
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+from config.settings import Config
 
 # Import extraction prompts
-from .extraction_prompts import (
-    get_aadhar_extraction_prompt,
-    get_rental_agreement_extraction_prompt,
-    get_pan_extraction_prompt,
-    get_passport_extraction_prompt,
-    get_driving_license_extraction_prompt,
-    get_address_proof_extraction_prompt,
-    get_bill_extraction_prompt,
-    get_passport_photo_extraction_prompt,
-    get_signature_extraction_prompt,
-    get_noc_extraction_prompt,
-    get_generic_extraction_prompt,
-    get_elec_bill_extraction_prompt,
-    get_consent_letter_extraction_prompt,
-    get_board_resolution_extraction_prompt,
-    get_msme_certificate_extraction_prompt,
-    get_dipp_certificate_extraction_prompt,
-    get_trademark_verification_document_prompt
-)
+from .extraction_prompts import EXTRACTION_PROMPTS, GENERIC_EXTRACTION_PROMPT, RESPONSE_VALIDATORS
+
+# Extraction logger with its detailed file log; the handler is attached once
+# here, not per service instance, so log lines are written exactly once
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+if not logger.handlers:
+    _file_handler = logging.FileHandler('document_extraction.log')
+    _file_handler.setLevel(logging.DEBUG)
+    _file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    ))
+    logger.addHandler(_file_handler)
+
+# HTTPS links straight to an image format the vision API accepts. These are
+# handed to OpenAI by URL, so the image is fetched server-side rather than
+# downloaded, re-encoded and uploaded again from here. Such URLs must be
+# publicly reachable (e.g. signed S3 links); otherwise the extraction is
+# retried through the download path.
+_RE_DIRECT_IMAGE_URL = re.compile(r'^https://[^?#]+\.(?:png|jpe?g|webp)(?:[?#]|$)', re.IGNORECASE)
+
+# File id in a Google Drive share link (.../file/d/<id>/view)
+_RE_DRIVE_FILE_ID = re.compile(r'/d/([a-zA-Z0-9_-]+)')
+
+# Clean-ups applied to a model reply's JSON when it does not parse as-is
+_RE_TRAILING_COMMA_OBJECT = re.compile(r',\s*}')
+_RE_TRAILING_COMMA_ARRAY = re.compile(r',\s*]')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# PDFs are rendered at this resolution; enough for the model to read printed
+# text while keeping the rendered page (and the upload) small
+_PDF_RENDER_DPI = 150
+
+# Passport-photo clarity: Laplacian variance below each threshold maps to the
+# score at the same index; at or above the last one it is excellent.
+# Low quality: 0-100, Medium: 100-500, High: 500+
+_CLARITY_THRESHOLDS = np.array([50, 100, 200, 400, 600])
+_CLARITY_SCORES = np.array([
+    0.1,  # Very poor
+    0.3,  # Poor
+    0.5,  # Fair
+    0.7,  # Good
+    0.8,  # Very good
+    0.9,  # Excellent
+])
+
+# Haar cascade (in cv2.data.haarcascades) used to check a passport photo shows
+# exactly one face when no YuNet model is configured (Config.FACE_DETECTION_MODEL)
+_FACE_CASCADE_FILE = 'haarcascade_frontalface_default.xml'
+
+# Photos are scaled down to at most this many pixels per side for YuNet; a
+# passport photo's face stays far above the detector's minimum size
+_FACE_DETECTOR_INPUT_SIZE = 320
+
+# Images already in one of these formats (and RGB, which the conversion
+# below produces) are sent as-is, up to the vision API's 20MB upload limit
+_PASSTHROUGH_IMAGE_FORMATS = frozenset({'PNG', 'JPEG'})
+_MAX_PASSTHROUGH_IMAGE_BYTES = 20 * 1024 * 1024
+
+# The vision model fits images within 2048x2048 and then scales the short
+# side down to 768px, so larger uploads only cost transfer time. Bigger
+# images are downscaled to those bounds here and sent as JPEG.
+_MAX_UPLOAD_LONG_SIDE = 2048
+_MAX_UPLOAD_SHORT_SIDE = 768
+_UPLOAD_JPEG_QUALITY = 85
+
+# Non-JPEG images above this size are downscaled with pyvips, when installed;
+# JPEGs are already decoded at reduced scale by PIL's draft mode
+_VIPS_MIN_BYTES = 5 * 1024 * 1024
+
+# Documents larger than this are not downloaded; they are read in chunks so
+# an oversized file is abandoned without being held in memory whole
+_MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Upper bound on documents of one batch downloaded (or re-extracted) at once
+_BATCH_IO_WORKERS = 8
+
+# Every capitalisation of the yes/no words the model may answer with, so
+# normalising a value is one lookup with no str.lower() copy
+_BOOLEAN_STRINGS = {
+    ''.join(variant): flag
+    for word, flag in (('true', True), ('false', False), ('yes', True), ('no', False))
+    for variant in itertools.product(*((char, char.upper()) for char in word))
+}
+
+# Malformed model replies are logged only up to this many characters
+_MAX_LOGGED_JSON_CHARS = 512
+
+# JSON mode: the model must reply with a single syntactically valid JSON
+# object, which every extraction prompt already asks for
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+@lru_cache(maxsize=256)
+def _contrast_table(mean: int) -> tuple:
+    """
+    Lookup table doubling contrast around a mean gray level
+    
+    Matches ImageEnhance.Contrast(2.0): values move twice as far from the
+    mean and are clipped to 0-255 (not mirrored, as convertScaleAbs would).
+    
+    Args:
+        mean (int): Rounded mean gray level of the image
+    
+    Returns:
+        tuple: 256 output levels, indexed by input level
+    """
+    return tuple(min(255, max(0, int(mean + 2.0 * (value - mean)))) for value in range(256))
+
+def _upload_target_size(size: tuple):
+    """
+    Size an image should be downscaled to before upload
+    
+    Args:
+        size (tuple): (width, height) of the image
+    
+    Returns:
+        tuple: (width, height) within the model's working resolution, or
+            None if the image already fits
+    """
+    width, height = size
+    scale = min(
+        _MAX_UPLOAD_LONG_SIDE / max(width, height),
+        _MAX_UPLOAD_SHORT_SIDE / min(width, height)
+    )
+    if scale >= 1:
+        return None
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
 
 class ExtractionService:
     """
     Advanced document data extraction service using AI Vision
     """
     
-    def __init__(self, openai_api_key=None):
+    def __init__(self, openai_api_key=None, face_detection_model=None):
         """
         Initialize the extraction service
         
         Args:
             openai_api_key (str, optional): OpenAI API key
+            face_detection_model (str, optional): YuNet ONNX model path
+                for passport-photo face detection
         """
         # Setup logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Logging handler for detailed tracking
-        file_handler = logging.FileHandler('document_extraction.log')
-        file_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        self.logger = logger
         
         # API Key configuration
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
@@ -67,6 +180,25 @@ class ExtractionService:
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
             self.logger.info("OpenAI API key initialized successfully")
+        
+        # Pooled keep-alive connections for document downloads, retrying
+        # transient server errors
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Per-thread face detectors; neither detector is safe to share
+        # between the threads documents are extracted on
+        self.face_detection_model = face_detection_model or Config.FACE_DETECTION_MODEL
+        self._face_detectors = threading.local()
+        
+        # Whether passport photos OpenCV confirms may skip the AI model
+        self.local_passport_photo_check = Config.LOCAL_PASSPORT_PHOTO_CHECK
     # def assess_passport_photo_opencv(self, image_path: str,document_type: str) -> Dict[str, Any]:
     #     try:
     #         image = cv2.imread(image_path)
@@ -90,51 +222,53 @@ class ExtractionService:
     #         self.logger.error(f"OpenCV fallback failed for passport photo: {str(e)}", exc_info=True)
     #         return self._create_extraction_failure_record(document_type, str(e))
     
-    def assess_passport_photo_opencv(self, image_path: str, doc_type: str = "passport_photo") -> Dict[str, Any]:
+    def assess_passport_photo_opencv(
+        self,
+        image: Union[str, bytes, np.ndarray],
+        doc_type: str = "passport_photo"
+    ) -> Dict[str, Any]:
         """
-        Fallback OpenCV-based passport photo assessment
+        OpenCV-based passport photo assessment
+        
+        Args:
+            image (str, bytes or numpy.ndarray): Image file path, encoded image
+                bytes, or an already decoded BGR/grayscale image
+            doc_type (str): Document type
+        
+        Returns:
+            dict: Assessment with clarity_score, is_recent, is_passport_style
+                and face_visible, plus 'error' if the image could not be assessed
         """
+        # OpenCV is only needed for passport photos, so it is imported here
+        # rather than slowing down every worker's startup
+        import cv2
+        
         try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError(f"Could not load image from {image_path}")
+            # Load image; colour is only needed by the YuNet detector, otherwise
+            # the image is decoded straight to grayscale for analysis
+            color = self._get_face_detector() is not None
+            decoded = self._decode_photo(image, color)
+            if decoded is None:
+                source = image if isinstance(image, str) else f"{type(image).__name__} input"
+                raise ValueError(f"Could not load image from {source}")
             
-            # Convert to grayscale for analysis
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(decoded, cv2.COLOR_BGR2GRAY) if color else decoded
             
-            # 1. CLARITY ASSESSMENT using Laplacian variance
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            # 1. CLARITY ASSESSMENT using Laplacian variance, reduced inside
+            # OpenCV; the 8-bit Laplacian (within +/-1020) fits int16 exactly
+            _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+            laplacian_var = float(laplacian_std[0, 0]) ** 2
             
             # Improved clarity score mapping based on typical ranges
-            # Low quality: 0-100, Medium: 100-500, High: 500+
-            if laplacian_var < 50:
-                clarity_score = 0.1  # Very poor
-            elif laplacian_var < 100:
-                clarity_score = 0.3  # Poor
-            elif laplacian_var < 200:
-                clarity_score = 0.5  # Fair
-            elif laplacian_var < 400:
-                clarity_score = 0.7  # Good
-            elif laplacian_var < 600:
-                clarity_score = 0.8  # Very good
-            else:
-                clarity_score = 0.9  # Excellent
+            clarity_score = float(_CLARITY_SCORES[np.searchsorted(_CLARITY_THRESHOLDS, laplacian_var, side='right')])
             
             # 2. FACE DETECTION
-            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            if not os.path.exists(cascade_path):
+            face_count = self._count_faces(decoded if color else None, gray)
+            if face_count is None:
                 self.logger.warning("Haar cascade file not found, assuming face visible")
                 face_visible = True  # Assume true if cascade not available
             else:
-                face_cascade = cv2.CascadeClassifier(cascade_path)
-                faces = face_cascade.detectMultiScale(
-                    gray, 
-                    scaleFactor=1.1, 
-                    minNeighbors=5,
-                    minSize=(30, 30)
-                )
-                face_visible = len(faces) ==1
+                face_visible = face_count == 1
             
             # 3. BASIC IMAGE QUALITY CHECKS
             height, width = gray.shape
@@ -171,6 +305,118 @@ class ExtractionService:
                 "error": str(e)
             }
     
+    def _decode_photo(self, image, color):
+        """
+        Decode a photo given as a file path, image bytes or a decoded array
+        
+        Args:
+            image (str, bytes or numpy.ndarray): Photo to decode
+            color (bool): Return a BGR image; otherwise a grayscale one
+        
+        Returns:
+            numpy.ndarray: Decoded image, or None if it could not be decoded
+        """
+        import cv2
+        
+        if isinstance(image, np.ndarray):
+            if image.ndim == 2:
+                return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if color else image
+            return image if color else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        flags = cv2.IMREAD_COLOR if color else cv2.IMREAD_GRAYSCALE
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            # Decoded straight from memory, without a temporary file
+            return cv2.imdecode(np.frombuffer(image, np.uint8), flags)
+        return cv2.imread(image, flags)
+
+    def _count_faces(self, image, gray):
+        """
+        Count the faces in a photo
+        
+        Uses the configured YuNet model (one forward pass on a downscaled
+        copy) when it loads, otherwise the Haar cascade.
+        
+        Args:
+            image (numpy.ndarray): BGR image, needed only when a YuNet
+                detector is available
+            gray (numpy.ndarray): Grayscale version of the image
+        
+        Returns:
+            int: Number of faces found, or None if no detector is available
+        """
+        import cv2
+        
+        face_detector = self._get_face_detector()
+        if face_detector is not None:
+            height, width = image.shape[:2]
+            scale = _FACE_DETECTOR_INPUT_SIZE / max(height, width)
+            if scale < 1:
+                image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            
+            face_detector.setInputSize((image.shape[1], image.shape[0]))
+            _, faces = face_detector.detect(image)
+            return 0 if faces is None else len(faces)
+        
+        face_cascade = self._get_face_cascade()
+        if face_cascade is None:
+            return None
+        
+        faces = face_cascade.detectMultiScale(
+            gray, 
+            scaleFactor=1.1, 
+            minNeighbors=5,
+            minSize=(30, 30)
+        )
+        return len(faces)
+    
+    def _get_face_detector(self):
+        """
+        Get this thread's YuNet face detector, loading it on first use
+        
+        Returns:
+            cv2.FaceDetectorYN: Loaded detector, or None if no model is
+                configured or it could not be loaded
+        """
+        import cv2
+        
+        if not self.face_detection_model:
+            return None
+        
+        face_detector = getattr(self._face_detectors, 'yunet', None)
+        if face_detector is None:
+            try:
+                face_detector = cv2.FaceDetectorYN.create(
+                    self.face_detection_model,
+                    "",
+                    (_FACE_DETECTOR_INPUT_SIZE, _FACE_DETECTOR_INPUT_SIZE)
+                )
+            except cv2.error as e:
+                self.logger.warning(
+                    "Could not load face detection model %s, using Haar cascade: %s",
+                    self.face_detection_model, e
+                )
+                # Remembered so the load is not retried on every photo
+                face_detector = False
+            self._face_detectors.yunet = face_detector
+        
+        return face_detector or None
+    
+    def _get_face_cascade(self):
+        """
+        Get this thread's Haar face cascade, loading it on first use
+        
+        Returns:
+            cv2.CascadeClassifier: Loaded cascade, or None if it could not be loaded
+        """
+        import cv2
+        
+        face_cascade = getattr(self._face_detectors, 'cascade', None)
+        if face_cascade is None:
+            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + _FACE_CASCADE_FILE)
+            self._face_detectors.cascade = face_cascade
+        
+        return None if face_cascade.empty() else face_cascade
+    
     def _convert_pdf_to_image(self, pdf_data):
         """
         Convert PDF to image
@@ -181,52 +427,28 @@ class ExtractionService:
         Returns:
             bytes: Converted image data
         """
+        # Imported on first PDF only; most documents are images
+        import fitz
+        
         try:
-            # Convert first page of PDF to image
-            images = convert_from_bytes(
-                pdf_data, 
-                first_page=1, 
-                last_page=1,
-                fmt='png'
-            )
-            
-            if not images:
-                self.logger.error("PDF to image conversion produced no images")
-                return None
+            # Render the first page in-process; only that page is decoded
+            with fitz.open(stream=pdf_data, filetype="pdf") as doc:
+                if doc.page_count == 0:
+                    self.logger.error("PDF to image conversion produced no images")
+                    return None
+                
+                pix = doc.load_page(0).get_pixmap(dpi=_PDF_RENDER_DPI, colorspace=fitz.csRGB, alpha=False)
             
             # Convert to bytes
+            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
             byte_arr = io.BytesIO()
-            images[0].save(byte_arr, format='PNG')
+            image.save(byte_arr, format='PNG')
             return byte_arr.getvalue()
         
         except Exception as e:
             self.logger.error(f"PDF conversion error: {str(e)}")
             return None
 
-    def _verify_aadhar_data(self, data):
-        """
-        Verify Aadhar document data
-        
-        Args:
-            data (dict): Extracted Aadhar data
-        
-        Returns:
-            dict: Verified data or None
-        """
-        required_fields = ['name', 'aadhar_number']
-        
-        for field in required_fields:
-            if not data.get(field):
-                self.logger.warning(f"Missing required Aadhar field: {field}")
-                return None
-        
-        # Optional validations
-        if data.get('is_masked', False):
-            self.logger.warning("Masked Aadhar not allowed")
-            return None
-        
-        return data
-
     def _verify_pan_data(self, data):
         """
         Verify PAN card document data
@@ -237,16 +459,8 @@ class ExtractionService:
         Returns:
             dict: Verified data or None
         """
-        required_fields = ['name', 'pan_number', 'dob']
-        
-        for field in required_fields:
-            if not data.get(field):
-                self.logger.warning(f"Missing required PAN field: {field}")
-                return None
-        
-        # Validate PAN number format
-        if not re.match(r'^[A-Z]{5}\d{4}[A-Z]{1}$', data['pan_number']):
-            self.logger.warning("Invalid PAN number format")
+        # Required fields and PAN number format
+        if not self._conforms_to_schema(data, 'pan'):
             return None
         
         return data
@@ -261,12 +475,8 @@ class ExtractionService:
         Returns:
             dict: Verified data or None
         """
-        required_fields = ['name', 'passport_number', 'dob', 'expiry_date']
-        
-        for field in required_fields:
-            if not data.get(field):
-                self.logger.warning(f"Missing required passport field: {field}")
-                return None
+        if not self._conforms_to_schema(data, 'passport'):
+            return None
         
         # Check passport validity
         try:
@@ -280,6 +490,30 @@ class ExtractionService:
         
         return data
 
+    def _assess_passport_photo_locally(self, image_data):
+        """
+        Assess a passport photo with OpenCV, keeping only confident results
+        
+        Args:
+            image_data (bytes): Passport photo image bytes
+        
+        Returns:
+            dict: Assessment that passes passport photo verification, or None
+                if the photo still needs the AI model
+        """
+        assessed_data = self.assess_passport_photo_opencv(image_data)
+        
+        if "error" in assessed_data:
+            return None
+        
+        verified_data = self._verify_passport_photo_data(assessed_data)
+        if verified_data is not None:
+            self.logger.info("Passport photo confirmed by OpenCV, skipping AI extraction")
+            # OpenCV only checks size, aspect ratio and face count, not the
+            # model's eyewear/mask/background/pose checks; mark the result
+            verified_data["extraction_method"] = "opencv"
+        return verified_data
+
     def _verify_passport_photo_data(self, data):
         """
         Verify passport photo data
@@ -343,19 +577,23 @@ class ExtractionService:
         Remove transparency, enhance clarity for signature image.
         Returns modified image bytes.
         """
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGBA")
+        image = Image.open(io.BytesIO(image_bytes))
 
-        # Remove transparency by pasting onto white background
-        if image.mode in ('RGBA', 'LA'):
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[-1])
+        # Convert to grayscale, removing any transparency by pasting onto a
+        # white background; only the single gray channel is composited
+        if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+            image = image.convert("RGBA")
+            background = Image.new("L", image.size, 255)
+            background.paste(image.convert("L"), mask=image.getchannel("A"))
             image = background
         else:
-            image = image.convert("RGB")
+            image = image.convert("L")
 
-        # Convert to grayscale and enhance contrast
-        image = image.convert("L")
-        image = ImageEnhance.Contrast(image).enhance(2.0)
+        # Enhance contrast; the same mapping as ImageEnhance.Contrast(2.0),
+        # applied as one lookup-table pass
+        histogram = image.histogram()
+        mean = int(sum(value * count for value, count in enumerate(histogram)) / (image.width * image.height) + 0.5)
+        image = image.point(_contrast_table(mean))
 
         # Pad small images
         min_w, min_h = 200, 80
@@ -382,59 +620,20 @@ class ExtractionService:
             self.logger.info(f"Starting extraction: {document_type}")
             self.logger.debug(f"Input source: {str(source)[:100]}")  # log only first 100 chars
 
-            # 1. Load document_data from file, URL, or base64
-            document_data = None
-            # --- PATCH: Support dict input with 'base64' or 'url' keys ---
-            if isinstance(source, dict):
-                if 'base64' in source:
-                    base64_str = source['base64']
-                    try:
-                        document_data = base64.b64decode(base64_str)
-                    except Exception:
-                        raise ValueError("Invalid base64 string in document source.")
-                elif 'url' in source:
-                    document_data = self._download_document(source['url'])
-                else:
-                    raise ValueError("Unsupported document source dict. Must have 'base64' or 'url' key.")
-            elif isinstance(source, str):
-                source = source.strip()
-                if os.path.isfile(source):
-                    with open(source, 'rb') as f:
-                        document_data = f.read()
-                elif source.startswith("http"):
-                    document_data = self._download_document(source)
-                else:
-                    # Try to decode as base64
-                    try:
-                        document_data = base64.b64decode(source)
-                    except Exception:
-                        raise ValueError("Unsupported document source type. Must be URL, file path, or base64 string.")
-            else:
-                raise ValueError("Unsupported document source type. Must be URL, file path, or base64 string or dict with 'base64'/'url'.")
-
-            if not document_data:
-                return self._create_extraction_failure_record(document_type, "Failed to load document")
-
-            # 2. Convert to image for AI model
-            # image_data = self._convert_to_supported_image(document_data)
-
-            # if not image_data:
-            #     return self._create_extraction_failure_record(document_type, "Image conversion failed")
-
-            # 2. Convert to image for AI model
-            # image_data = self._convert_to_supported_image(document_data)
-            image_data = self._preprocess_signature_image(document_data) if document_type == "signature" else self._convert_to_supported_image(document_data)
-
-            if not image_data:
-                return self._create_extraction_failure_record(document_type, "Image conversion failed")
-
-            # ➕ NEW: Preprocess signature image before extraction
-            # if document_type.lower() == "signature":
-            #     try:
-            #         image_data = self._preprocess_signature_image(image_data)
-            #     except Exception as e:
-            #         self.logger.warning(f"Preprocessing failed for signature image: {e}")
+            # 1-2. Load the document and convert it to an image for the AI model
+            # (passport photos checked locally first are always downloaded)
+            check_locally = document_type == "passport_photo" and self.local_passport_photo_check
+            image_data, load_error = self._load_document_image(
+                source, document_type, allow_direct_url=not check_locally
+            )
+            if load_error:
+                return self._create_extraction_failure_record(document_type, load_error)
 
+            # Passport photos OpenCV already confirms need no AI request
+            if check_locally:
+                assessed_data = self._assess_passport_photo_locally(image_data)
+                if assessed_data is not None:
+                    return self._finalize_extraction(assessed_data, document_type)
 
             # 3. Choose extraction prompt
             extraction_prompt = self._select_extraction_prompt(document_type)
@@ -442,45 +641,205 @@ class ExtractionService:
             # 4. Run AI-based extraction
             extracted_data = self._extract_with_ai(image_data, document_type, extraction_prompt)
 
+            # OpenAI could not use the URL directly; download and upload it instead
+            if extracted_data is None and isinstance(image_data, str):
+                self.logger.warning(f"Direct URL extraction failed for {document_type}, retrying with download")
+                image_data, load_error = self._load_document_image(source, document_type, allow_direct_url=False)
+                if load_error:
+                    return self._create_extraction_failure_record(document_type, load_error)
+                extracted_data = self._extract_with_ai(image_data, document_type, extraction_prompt)
+
             # 5. Verify extracted data
-            verified_data = self._verify_extracted_data(extracted_data, document_type)
+            verified_data = self._finalize_extraction(extracted_data, document_type)
 
             self.logger.info(
                 f"Completed extraction for {document_type} in {(datetime.now() - extraction_start_time).total_seconds():.2f} seconds"
             )
-            # Ensure 'is_valid' is set based on heuristics
-            # if isinstance(verified_data, dict):
-            #     if "is_valid" not in verified_data:
-            #         # Use 'valid' or 'is_valid_*' as fallback
-            #         valid_flag = (
-            #             verified_data.get("valid", "").lower() == "yes"
-            #             or verified_data.get(f"is_valid_{document_type.lower()}", False)
-            #             or verified_data.get("valid_document", "").lower() == "yes"
-            #         )
-            #         verified_data["is_valid"] = bool(valid_flag)
-            # Ensure 'is_valid' is set based on any available flag
-            if isinstance(verified_data, dict):
-                if "is_valid" not in verified_data:
-                    raw_flag = (
-                        verified_data.get("valid") or
-                        verified_data.get(f"is_valid_{document_type.lower()}") or
-                        verified_data.get("valid_document")
-                    )
-
-                    # Safely convert string "yes"/"true" or raw boolean into boolean
-                    if isinstance(raw_flag, str):
-                        valid_flag = raw_flag.strip().lower() in ["yes", "true"]
-                    else:
-                        valid_flag = bool(raw_flag)
-
-                    verified_data["is_valid"] = valid_flag
-
-            return verified_data or self._create_extraction_failure_record(document_type, "Verification failed")
+            return verified_data
 
         except Exception as e:
             self.logger.error(f"Extraction error for {document_type}: {str(e)}", exc_info=True)
             return self._create_extraction_failure_record(document_type, str(e))
 
+    def extract_document_batch(
+        self,
+        sources: Dict[str, Any],
+        document_types: Dict[str, str]
+    ) -> Dict[str, dict]:
+        """
+        Extract several documents with a single AI request
+        
+        All images go into one chat message with a combined prompt asking for
+        a JSON object keyed by document key, saving a round trip and prefill
+        per document. Documents are loaded concurrently; those that fail to
+        load get failure records, passport photos OpenCV confirms skip the AI
+        request when LOCAL_PASSPORT_PHOTO_CHECK is on (as in
+        extract_document_data), and any the combined response
+        misses are retried concurrently, one request each, through
+        extract_document_data.
+        
+        Args:
+            sources (dict): Document key -> URL, local file path or base64 string
+            document_types (dict): Document key -> document type
+        
+        Returns:
+            dict: Document key -> extracted document data
+        """
+        if len(sources) == 1:
+            (doc_key, source), = sources.items()
+            return {doc_key: self.extract_document_data(source, document_types[doc_key])}
+
+        extraction_start_time = datetime.now()
+        results = {}
+        images = {}
+
+        def load(doc_key):
+            document_type = document_types[doc_key]
+            try:
+                # Passport photos checked locally first are always downloaded,
+                # exactly as in extract_document_data
+                check_locally = document_type == "passport_photo" and self.local_passport_photo_check
+                image_data, load_error = self._load_document_image(
+                    sources[doc_key], document_type, allow_direct_url=not check_locally
+                )
+                if check_locally and not load_error:
+                    return image_data, None, self._assess_passport_photo_locally(image_data)
+                return image_data, load_error, None
+            except Exception as e:
+                self.logger.error(f"Extraction error for {document_type}: {str(e)}", exc_info=True)
+                return None, str(e), None
+
+        with ThreadPoolExecutor(max_workers=min(len(sources), _BATCH_IO_WORKERS)) as executor:
+            loaded = dict(zip(sources, executor.map(load, sources)))
+
+        for doc_key, (image_data, load_error, assessed_data) in loaded.items():
+            if load_error:
+                results[doc_key] = self._create_extraction_failure_record(document_types[doc_key], load_error)
+            elif assessed_data is not None:
+                results[doc_key] = self._finalize_extraction(assessed_data, document_types[doc_key])
+            else:
+                images[doc_key] = image_data
+
+        if len(images) > 1:
+            batch_data = self._extract_batch_with_ai(images, document_types) or {}
+            for doc_key in images:
+                extracted_data = batch_data.get(doc_key)
+                if isinstance(extracted_data, dict):
+                    self._normalize_extracted_booleans(extracted_data)
+                    results[doc_key] = self._finalize_extraction(extracted_data, document_types[doc_key])
+            self.logger.info(
+                f"Completed batch extraction of {len(images)} documents in {(datetime.now() - extraction_start_time).total_seconds():.2f} seconds"
+            )
+
+        # Fall back to one request per document for anything the batch missed
+        missed = [doc_key for doc_key in images if doc_key not in results]
+        if missed:
+            with ThreadPoolExecutor(max_workers=min(len(missed), _BATCH_IO_WORKERS)) as executor:
+                results.update(zip(missed, executor.map(
+                    lambda doc_key: self.extract_document_data(sources[doc_key], document_types[doc_key]),
+                    missed
+                )))
+
+        return {doc_key: results[doc_key] for doc_key in sources}
+
+    def _load_document_image(self, source: Any, document_type: str, allow_direct_url: bool = True):
+        """
+        Load a document and convert it to an image for the AI model
+        
+        Args:
+            source: URL, local file path, base64 string, or dict with 'base64'/'url'
+            document_type (str): Type of document
+            allow_direct_url (bool): Return direct image URLs as-is instead of
+                downloading them (signatures are always downloaded for preprocessing)
+        
+        Returns:
+            tuple: (image bytes or direct image URL, None) on success,
+                or (None, failure message)
+        
+        Raises:
+            ValueError: If the source type is unsupported
+        """
+        if (
+            allow_direct_url
+            and document_type != "signature"
+            and isinstance(source, str)
+            and _RE_DIRECT_IMAGE_URL.match(source.strip())
+        ):
+            return source.strip(), None
+
+        # 1. Load document_data from file, URL, or base64
+        document_data = None
+        # --- PATCH: Support dict input with 'base64' or 'url' keys ---
+        if isinstance(source, dict):
+            if 'base64' in source:
+                base64_str = source['base64']
+                try:
+                    document_data = base64.b64decode(base64_str)
+                except Exception:
+                    raise ValueError("Invalid base64 string in document source.")
+            elif 'url' in source:
+                document_data = self._download_document(source['url'])
+            else:
+                raise ValueError("Unsupported document source dict. Must have 'base64' or 'url' key.")
+        elif isinstance(source, str):
+            source = source.strip()
+            if os.path.isfile(source):
+                with open(source, 'rb') as f:
+                    document_data = f.read()
+            elif source.startswith("http"):
+                document_data = self._download_document(source)
+            else:
+                # Try to decode as base64
+                try:
+                    document_data = base64.b64decode(source)
+                except Exception:
+                    raise ValueError("Unsupported document source type. Must be URL, file path, or base64 string.")
+        else:
+            raise ValueError("Unsupported document source type. Must be URL, file path, or base64 string or dict with 'base64'/'url'.")
+
+        if not document_data:
+            return None, "Failed to load document"
+
+        # 2. Convert to image for AI model
+        image_data = self._preprocess_signature_image(document_data) if document_type == "signature" else self._convert_to_supported_image(document_data)
+
+        if not image_data:
+            return None, "Image conversion failed"
+
+        return image_data, None
+
+    def _finalize_extraction(self, extracted_data, document_type):
+        """
+        Verify extracted data and make sure it carries an 'is_valid' flag
+        
+        Args:
+            extracted_data (dict): Parsed AI extraction result
+            document_type (str): Type of document
+        
+        Returns:
+            dict: Verified data, or a failure record if verification failed
+        """
+        verified_data = self._verify_extracted_data(extracted_data, document_type)
+
+        # Ensure 'is_valid' is set based on any available flag
+        if isinstance(verified_data, dict):
+            if "is_valid" not in verified_data:
+                raw_flag = (
+                    verified_data.get("valid") or
+                    verified_data.get(f"is_valid_{document_type.lower()}") or
+                    verified_data.get("valid_document")
+                )
+
+                # Safely convert string "yes"/"true" or raw boolean into boolean
+                if isinstance(raw_flag, str):
+                    valid_flag = raw_flag.strip().lower() in ["yes", "true"]
+                else:
+                    valid_flag = bool(raw_flag)
+
+                verified_data["is_valid"] = valid_flag
+
+        return verified_data or self._create_extraction_failure_record(document_type, "Verification failed")
+
         
     def _select_extraction_prompt(self, document_type):
         """
@@ -492,30 +851,9 @@ class ExtractionService:
         Returns:
             str: Extraction prompt
         """
-        extraction_prompts = {
-            'aadhar': get_aadhar_extraction_prompt(),
-            'aadhar_front': get_aadhar_extraction_prompt(),
-            'aadhar_back': get_aadhar_extraction_prompt(),
-            'pan': get_pan_extraction_prompt(),
-            'passport': get_passport_extraction_prompt(),
-            'passport_photo': get_passport_photo_extraction_prompt(),
-            'address_proof': get_address_proof_extraction_prompt(),
-            'electricity_bill': get_bill_extraction_prompt(),
-            'elec_bill': get_elec_bill_extraction_prompt(),
-            'signature': get_signature_extraction_prompt(),
-            'driving_license': get_driving_license_extraction_prompt(),
-            'noc': get_noc_extraction_prompt(),
-            'consent_letter': get_consent_letter_extraction_prompt(),
-            'board_resolution': get_board_resolution_extraction_prompt(),
-            'msme_certificate': get_msme_certificate_extraction_prompt(),
-            'dipp_certificate': get_dipp_certificate_extraction_prompt(),
-            'trademark_verification': get_trademark_verification_document_prompt(),
-            'rental_agreement': get_rental_agreement_extraction_prompt()
-        }
-        
-        return extraction_prompts.get(
+        return EXTRACTION_PROMPTS.get(
             document_type.lower(), 
-            get_generic_extraction_prompt()
+            GENERIC_EXTRACTION_PROMPT
         )
     
     def _verify_extracted_data(self, extracted_data, document_type):
@@ -533,19 +871,11 @@ class ExtractionService:
             return None
         
         # Implement type-specific verification logic
-        verifications = {
-            'aadhar': self._verify_aadhar_data,
-            'pan': self._verify_pan_data,
-            'passport': self._verify_passport_data,
-            # Add more verification methods for different document types
-        }
-        
-        verification_method = verifications.get(
-            document_type.lower(), 
-            self._generic_data_verification
-        )
+        verification_method = self._VERIFIERS.get(document_type.lower())
+        if verification_method is None:
+            return self._generic_data_verification(extracted_data)
         
-        return verification_method(extracted_data)
+        return verification_method(self, extracted_data)
     
     def _verify_aadhar_data(self, data):
         """
@@ -557,15 +887,29 @@ class ExtractionService:
         Returns:
             dict: Verified data or None
         """
-        required_fields = ['name', 'aadhar_number', 'address']
-        
-        for field in required_fields:
-            if not data.get(field):
-                self.logger.warning(f"Missing required Aadhar field: {field}")
-                return None
+        if not self._conforms_to_schema(data, 'aadhar'):
+            return None
         
         return data
     
+    def _conforms_to_schema(self, data, document_type):
+        """
+        Check extracted data against the document type's compiled response schema
+        
+        Args:
+            data (dict): Extracted document data
+            document_type (str): Key into RESPONSE_VALIDATORS
+        
+        Returns:
+            bool: Whether the data has every required field (and valid formats)
+        """
+        try:
+            RESPONSE_VALIDATORS[document_type](data)
+            return True
+        except fastjsonschema.JsonSchemaValueException as e:
+            self.logger.warning(f"Invalid {document_type} data: {e.message}")
+            return False
+    
     # Similar verification methods for other document types...
     
     def _generic_data_verification(self, data):
@@ -593,6 +937,15 @@ class ExtractionService:
         
         return data
     
+    # Type-specific verifiers used by _verify_extracted_data; other document
+    # types get _generic_data_verification. Add more verification methods
+    # for different document types here.
+    _VERIFIERS = {
+        'aadhar': _verify_aadhar_data,
+        'pan': _verify_pan_data,
+        'passport': _verify_passport_data,
+    }
+    
     def _create_extraction_failure_record(self, document_type, error_message):
         """
         Create a standardized failure record for extraction
@@ -618,7 +971,7 @@ class ExtractionService:
             # Enhanced Google Drive link handling
             if 'drive.google.com' in url:
                 # Extract file ID more robustly
-                file_id_match = re.search(r'/d/([a-zA-Z0-9_-]+)', url)
+                file_id_match = _RE_DRIVE_FILE_ID.search(url)
                 if file_id_match:
                     file_id = file_id_match.group(1)
                     url = f'https://drive.google.com/uc?export=download&id={file_id}'
@@ -629,19 +982,26 @@ class ExtractionService:
                 "Accept": "*/*"
             }
             
-            response = requests.get(
+            with self._session.get(
                 url, 
                 headers=headers, 
                 allow_redirects=True,
-                timeout=30
-            )
-            
-            # Validate response
-            if response.status_code == 200:
-                return response.content
-            
-            self.logger.error(f"Download failed: {response.status_code}")
-            return None
+                timeout=30,
+                stream=True
+            ) as response:
+                # Validate response
+                if response.status_code != 200:
+                    self.logger.error(f"Download failed: {response.status_code}")
+                    return None
+                
+                content = io.BytesIO()
+                for chunk in response.iter_content(_DOWNLOAD_CHUNK_BYTES):
+                    content.write(chunk)
+                    if content.tell() > _MAX_DOWNLOAD_BYTES:
+                        self.logger.error(f"Download exceeds {_MAX_DOWNLOAD_BYTES} bytes: {url}")
+                        return None
+                
+                return content.getvalue()
         
         except Exception as e:
             self.logger.error(f"Document download error: {str(e)}")
@@ -687,13 +1047,28 @@ class ExtractionService:
             # Try opening as an image first
             try:
                 with Image.open(io.BytesIO(document_data)) as img:
+                    # Supported RGB images need no conversion; Image.open has
+                    # only read the header, so nothing has been decoded yet
+                    if (
+                        file_type in _PASSTHROUGH_IMAGE_FORMATS
+                        and img.mode == 'RGB'
+                        and len(document_data) <= _MAX_PASSTHROUGH_IMAGE_BYTES
+                    ):
+                        return document_data
+                    
                     # Convert to RGB mode to ensure compatibility
                     if img.mode != 'RGB':
                         img = img.convert('RGB')
                     
-                    # Save to a bytes buffer in PNG format
+                    # Save to a bytes buffer in PNG format. Full-size pixels
+                    # are kept for the local OpenCV checks; images that are
+                    # downscaled to JPEG for upload anyway get the fastest
+                    # (still lossless) compression level
                     byte_arr = io.BytesIO()
-                    img.save(byte_arr, format='PNG')
+                    if _upload_target_size(img.size) is not None:
+                        img.save(byte_arr, format='PNG', compress_level=1)
+                    else:
+                        img.save(byte_arr, format='PNG')
                     return byte_arr.getvalue()
             except (Image.UnidentifiedImageError, IOError) as img_err:
                 self.logger.warning(f"Image opening failed: {img_err}")
@@ -721,12 +1096,104 @@ class ExtractionService:
 
     
 
+    def _image_content_part(self, image_data):
+        """
+        Build the chat message content part for an image
+        
+        Args:
+            image_data (bytes or str): Image bytes, or a direct image URL
+        
+        Returns:
+            dict: 'image_url' content part
+        """
+        if isinstance(image_data, str):
+            return {"type": "image_url", "image_url": {"url": image_data}}
+        
+        image_data = self._downscale_for_upload(image_data)
+        
+        # JPEGs are passed through unconverted, so label them accurately
+        mime_type = "image/jpeg" if image_data.startswith(b'\xff\xd8\xff') else "image/png"
+        base64_image = base64.b64encode(image_data).decode('utf-8')
+        return {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{base64_image}"}}
+
+    def _downscale_for_upload(self, image_data):
+        """
+        Shrink an image the vision model would downscale anyway
+        
+        Args:
+            image_data (bytes): Image bytes
+        
+        Returns:
+            bytes: JPEG bytes within the model's working resolution, or the
+                original bytes if they already fit or cannot be read
+        """
+        try:
+            with Image.open(io.BytesIO(image_data)) as img:
+                width, height = img.size
+                target_size = _upload_target_size(img.size)
+                if target_size is None:
+                    return image_data
+                
+                if pyvips is not None and img.format != 'JPEG' and len(image_data) > _VIPS_MIN_BYTES:
+                    downscaled = self._downscale_with_vips(image_data, target_size)
+                    if downscaled is not None:
+                        self.logger.debug(
+                            f"Downscaled {width}x{height} image from {len(image_data)} to {len(downscaled)} bytes for upload with libvips"
+                        )
+                        return downscaled
+                
+                mode = 'L' if img.mode == 'L' else 'RGB'
+                
+                # Let libjpeg decode JPEGs at the smallest 1/2, 1/4 or 1/8
+                # scale still covering the target size; other formats ignore this
+                img.draft(mode, target_size)
+                img = img.convert(mode)
+                img.thumbnail(target_size, Image.LANCZOS)
+                byte_arr = io.BytesIO()
+                img.save(byte_arr, format='JPEG', quality=_UPLOAD_JPEG_QUALITY)
+        except (Image.UnidentifiedImageError, OSError, ValueError) as e:
+            self.logger.warning(f"Could not downscale image, sending original: {e}")
+            return image_data
+        
+        self.logger.debug(
+            f"Downscaled {width}x{height} image from {len(image_data)} to {byte_arr.tell()} bytes for upload"
+        )
+        return byte_arr.getvalue()
+
+    def _downscale_with_vips(self, image_data, target_size):
+        """
+        Downscale an image with libvips, streaming it rather than decoding it whole
+        
+        Args:
+            image_data (bytes): Image bytes
+            target_size (tuple): (width, height) box to fit the image within
+        
+        Returns:
+            bytes: JPEG bytes, or None to fall back to PIL
+        """
+        try:
+            image = pyvips.Image.thumbnail_buffer(
+                image_data, target_size[0], height=target_size[1], size='down'
+            )
+            # 8-bit images only; anything else takes PIL's conversion path
+            if image.format != 'uchar':
+                return None
+            
+            # Drop alpha, as PIL's RGB/L conversion does
+            if image.hasalpha():
+                image = image.extract_band(0, n=image.bands - 1)
+            
+            return image.write_to_buffer('.jpg', Q=_UPLOAD_JPEG_QUALITY)
+        except pyvips.Error as e:
+            self.logger.warning(f"libvips downscale failed, using PIL: {e}")
+            return None
+
     def _extract_with_ai(self, image_data, document_type, extraction_prompt):
         """
         Extract document data using AI with improved error handling
         
         Args:
-            image_data (bytes): Image data to extract
+            image_data (bytes or str): Image data to extract, or a direct image URL
             document_type (str): Type of document being extracted
             extraction_prompt (str): Specific prompt for document extraction
         
@@ -734,33 +1201,107 @@ class ExtractionService:
             dict or None: Extracted document data
         """
         try:
-            # Encode image to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+            # Call OpenAI API
+            response = openai.ChatCompletion.create(
+                **self._extraction_request(image_data, extraction_prompt)
+            )
             
+            # Parse response
+            extracted_text = response.choices[0].message.content
+            return self._parse_extraction_result(extracted_text, document_type)
+        
+        except Exception as e:
+            self.logger.error(f"AI extraction error for {document_type}: {str(e)}")
+            return None
+
+    def _extraction_request(self, image_data, extraction_prompt):
+        """
+        Build the chat completion arguments for a single-document extraction
+        
+        Args:
+            image_data (bytes or str): Image data to extract, or a direct image URL
+            extraction_prompt (str): Specific prompt for document extraction
+        
+        Returns:
+            dict: Keyword arguments for openai.ChatCompletion.create
+        """
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "You are a precise document data extraction assistant."},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": extraction_prompt},
+                        self._image_content_part(image_data)
+                    ]
+                }
+            ],
+            "max_tokens": 300,
+            "response_format": _JSON_RESPONSE_FORMAT
+        }
+
+    def _extract_batch_with_ai(self, images, document_types):
+        """
+        Extract several documents in one AI request
+        
+        Args:
+            images (dict): Document key -> image bytes or direct image URL, in prompt order
+            document_types (dict): Document key -> document type
+        
+        Returns:
+            dict or None: Document key -> raw extracted data
+        """
+        try:
+            doc_keys = list(images)
+            content = [{
+                "type": "text",
+                "text": f"You are given {len(doc_keys)} document images, in this order: "
+                + ", ".join(f"{doc_key} ({document_types[doc_key]})" for doc_key in doc_keys)
+                + ". Each image comes right after its ### heading and instructions. Return one JSON object "
+                + "with exactly these keys: " + ", ".join(doc_keys)
+                + ", each holding that document's JSON as described in its instructions."
+            }]
+            for doc_key in doc_keys:
+                # Label each image with its key so results cannot swap between documents
+                content.append({
+                    "type": "text",
+                    "text": f"### {doc_key}\n{self._select_extraction_prompt(document_types[doc_key])}"
+                })
+                content.append(self._image_content_part(images[doc_key]))
+
             # Call OpenAI API
             response = openai.ChatCompletion.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a precise document data extraction assistant."},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": extraction_prompt},
-                            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}"}}
-                        ]
-                    }
+                    {"role": "user", "content": content}
                 ],
-                max_tokens=300
+                max_tokens=300 * len(doc_keys),
+                response_format=_JSON_RESPONSE_FORMAT
             )
-            
+
             # Parse response
             extracted_text = response.choices[0].message.content
-            return self._parse_extraction_result(extracted_text, document_type)
-        
+            return self._parse_extraction_result(extracted_text, "batch")
+
         except Exception as e:
-            self.logger.error(f"AI extraction error for {document_type}: {str(e)}")
+            self.logger.error(f"AI batch extraction error: {str(e)}")
             return None
 
+    def _normalize_extracted_booleans(self, parsed_data):
+        """
+        Convert 'true'/'false'/'yes'/'no' string values to booleans in place
+        
+        Args:
+            parsed_data (dict): Parsed extraction result
+        """
+        parsed_data.update({
+            key: _BOOLEAN_STRINGS[value]
+            for key, value in parsed_data.items()
+            if isinstance(value, str) and value in _BOOLEAN_STRINGS
+        })
+
     def _parse_extraction_result(self, extraction_text, document_type):
         """
         Parse AI extraction result with more robust error handling
@@ -774,45 +1315,40 @@ class ExtractionService:
         """
         try:
             # Log the full extraction text for debugging
-            self.logger.info(f"Full extraction text for {document_type}: {extraction_text}")
+            self.logger.debug("Full extraction text for %s: %s", document_type, extraction_text)
             
-            # More flexible JSON extraction
-            json_match = re.search(r'{.*}', extraction_text, re.DOTALL | re.MULTILINE)
+            # More flexible JSON extraction: from the first '{' to the last '}'
+            json_start = extraction_text.find('{')
+            json_end = extraction_text.rfind('}') + 1
             
-            if json_match:
+            if json_start >= 0 and json_end > json_start:
+                json_str = extraction_text[json_start:json_end]
                 try:
-                    # Try to clean up the JSON string
-                    json_str = json_match.group(0)
-                    
-                    # Remove trailing commas and extra whitespaces
-                    json_str = re.sub(r',\s*}', '}', json_str)  # Remove trailing commas in objects
-                    json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas in arrays
-                    json_str = re.sub(r'\s+', ' ', json_str)  # Reduce whitespaces
-                    
-                    parsed_data = json.loads(json_str)
-                    
-                    # Log parsed data
-                    self.logger.info(f"Parsed data for {document_type}: {parsed_data}")
-                    
-                    # Ensure standard boolean values 
-                    for key, value in parsed_data.items():
-                        if isinstance(value, str):
-                            if value.lower() == 'true':
-                                parsed_data[key] = True
-                            elif value.lower() == 'false':
-                                parsed_data[key] = False
-                            elif value.lower() == 'yes':
-                                parsed_data[key] = True
-                            elif value.lower() == 'no':
-                                parsed_data[key] = False
-                    
-                    return parsed_data
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"JSON parsing error for {document_type}: {e}")
-                    self.logger.error(f"Problematic JSON string: {json_str}")
+                    # JSON-mode replies normally parse as they are
+                    parsed_data = orjson.loads(json_str)
+                except orjson.JSONDecodeError:
+                    try:
+                        # Remove trailing commas and extra whitespaces, then retry
+                        json_str = _RE_TRAILING_COMMA_OBJECT.sub('}', json_str)  # Remove trailing commas in objects
+                        json_str = _RE_TRAILING_COMMA_ARRAY.sub(']', json_str)  # Remove trailing commas in arrays
+                        json_str = _RE_WHITESPACE.sub(' ', json_str)  # Reduce whitespaces
+                        
+                        parsed_data = orjson.loads(json_str)
+                    except orjson.JSONDecodeError as e:
+                        self.logger.error("JSON parsing error for %s: %s", document_type, e)
+                        self.logger.error("Problematic JSON string: %s", json_str[:_MAX_LOGGED_JSON_CHARS])
+                        return None
+                
+                # Log parsed data
+                self.logger.info("Parsed data for %s: %s", document_type, parsed_data)
+                
+                # Ensure standard boolean values 
+                self._normalize_extracted_booleans(parsed_data)
+                
+                return parsed_data
             
             return None
         
         except Exception as e:
-            self.logger.error(f"Result parsing error for {document_type}: {str(e)}")
+            self.logger.error("Result parsing error for %s: %s", document_type, e)
             return None
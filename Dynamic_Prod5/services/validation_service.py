@@ -50,6 +50,17 @@ class DocumentValidationService:
             Config.OPENAI_API_KEY
         )
         self.aadhar_pan_linkage_service = AadharPanLinkageService()
+        
+        # Shared pool for director document downloads/extractions, so the
+        # total stays at DOC_WORKERS however many requests run at once
+        self._doc_pool = ThreadPoolExecutor(
+            max_workers=Config.DOC_WORKERS,
+            thread_name_prefix="validation-doc"
+        )
+    
+    def close(self):
+        """Shut down the document worker pool"""
+        self._doc_pool.shutdown(wait=True)
 
     def _get_compliance_rules(self, service_id: str) -> Dict:
         """
@@ -479,8 +490,6 @@ class DocumentValidationService:
             Tuple[Dict[str, Any], Dict[str, Any]]: Validation results
         """
         start_time = time.time()
-
-        self._current_preconditions = input_data.get('preconditions', {})
         
         # CRITICAL: FORCE the service ID rules
         def force_service_id_rules(rules, target_service_id):
@@ -1098,20 +1107,8 @@ class DocumentValidationService:
             else:
                 rule_validations['director_count'] = {"status": "passed", "error_message": None}
 
-        # Preprocess docs in parallel
-        processed_directors = {}
-        with ThreadPoolExecutor(max_workers=min(5, len(directors))) as executor:
-            futures = {
-                executor.submit(self._process_director_documents_parallel, info.get('documents', {})): key
-                for key, info in directors.items()
-            }
-            for future in as_completed(futures):
-                key = futures[future]
-                try:
-                    processed_directors[key] = future.result()
-                except Exception as e:
-                    self.logger.error(f"Doc processing error for {key}: {e}", exc_info=True)
-                    processed_directors[key] = {}
+        # Preprocess every director's docs in one shared pool
+        processed_directors = self._process_all_director_documents(directors)
 
         full_director_data = {
             key: {
@@ -1380,6 +1377,49 @@ class DocumentValidationService:
 
         return processed_docs
 
+    def _process_all_director_documents(
+        self,
+        directors: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Extract all director documents concurrently on the shared document pool
+        
+        Args:
+            directors (dict): Director information keyed by director id
+        
+        Returns:
+            dict: Director id -> processed documents keyed by document key
+        """
+        processed_directors = {key: {} for key in directors}
+        jobs = [
+            (director_key, doc_key, doc_content)
+            for director_key, info in directors.items()
+            for doc_key, doc_content in (info.get('documents') or {}).items()
+            if isinstance(doc_content, str) and doc_content
+        ]
+        if not jobs:
+            return processed_directors
+
+        futures = {
+            self._doc_pool.submit(self._extract_document_data_safe, doc_key, doc_content): (director_key, doc_key)
+            for director_key, doc_key, doc_content in jobs
+        }
+        for future in as_completed(futures):
+            director_key, doc_key = futures[future]
+            try:
+                processed_directors[director_key][doc_key] = future.result()
+            except Exception as e:
+                self.logger.error(
+                    f"Error processing document {doc_key} for {director_key}: {str(e)}",
+                    exc_info=True
+                )
+                processed_directors[director_key][doc_key] = {
+                    "is_valid": False,
+                    "error": str(e)
+                }
+
+        return processed_directors
+
     def _process_company_documents(self, company_docs: Dict[str, str]) -> Dict[str, Any]:
         processed_docs = {}
         
@@ -1431,7 +1471,8 @@ class DocumentValidationService:
             if address_rule:
                 result = self._validate_company_address_proof_rule(
                     extracted_docs,
-                    address_rule.get('conditions', {})
+                    address_rule.get('conditions', {}),
+                    preconditions
                 )
                 if result["status"] != "passed":
                     validation_errors.append(result["error_message"])
@@ -1498,7 +1539,8 @@ class DocumentValidationService:
                     opencv_result["extraction_method"] = "opencv_fallback"
                     extracted_data = opencv_result
                 else:
-                    extracted_data["extraction_method"] = "primary_extraction"
+                    # Photos confirmed locally already carry "opencv"
+                    extracted_data.setdefault("extraction_method", "primary_extraction")
                 # Step 2: Fallback to OpenCV if result is empty or lacks clarity_score
                 # if not isinstance(extracted_data, dict) or "clarity_score" not in extracted_data:
                 #     self.logger.warning("Fallback to OpenCV for passport photo due to missing clarity_score")
@@ -2023,7 +2065,8 @@ class DocumentValidationService:
         self, 
         directors_validation: Dict, 
         company_docs_validation: Dict,
-        compliance_rules: Dict
+        compliance_rules: Dict,
+        preconditions: Dict = None
     ) -> Dict:
         """
         Apply compliance rules dynamically based on Elasticsearch configuration
@@ -2032,6 +2075,7 @@ class DocumentValidationService:
             directors_validation (dict): Director document validation results
             company_docs_validation (dict): Company document validation results
             compliance_rules (dict): Compliance rules from Elasticsearch
+            preconditions (dict, optional): Request preconditions
         
         Returns:
             dict: Detailed compliance rule validation results
@@ -2111,16 +2155,16 @@ class DocumentValidationService:
                     
                     # For NOC Owner validation, we need preconditions
                     if rule_id == "NOC_OWNER_VALIDATION":
-                        # Get preconditions from the last called validate_documents method
-                        preconditions = getattr(self, '_current_preconditions', {})
-                        validation_result = validation_method(company_docs_validation, conditions, preconditions)
+                        validation_result = validation_method(company_docs_validation, conditions, preconditions or {})
                     # Determine which data to pass based on rule type
                     elif rule_id in ["DIRECTOR_COUNT", "PASSPORT_PHOTO", "SIGNATURE", 
                                 "ADDRESS_PROOF", "INDIAN_DIRECTOR_PAN", 
                                 "INDIAN_DIRECTOR_AADHAR", "FOREIGN_DIRECTOR_DOCS", 
                                 "AADHAR_PAN_LINKAGE"]:
                         validation_result = validation_method(directors_validation, conditions)
-                    elif rule_id in ["COMPANY_ADDRESS_PROOF", "NOC_VALIDATION"]:
+                    elif rule_id == "COMPANY_ADDRESS_PROOF":
+                        validation_result = validation_method(company_docs_validation, conditions, preconditions)
+                    elif rule_id == "NOC_VALIDATION":
                         validation_result = validation_method(company_docs_validation, conditions)
                     else:
                         self.logger.warning(f"Unhandled rule type: {rule_id}")
@@ -2791,13 +2835,15 @@ class DocumentValidationService:
 
     
 
-    def _validate_company_address_proof_rule(self, company_docs_validation, conditions):
+    def _validate_company_address_proof_rule(self, company_docs_validation, conditions, preconditions=None):
         """
         Validate company address proof with comprehensive date and address parsing
         
         Args:
             company_docs_validation (dict): Company document validation data
             conditions (dict): Rule conditions from compliance rules
+            preconditions (dict, optional): Request preconditions, used for
+                the company name when name matching is required
             
         Returns:
             dict: Validation result with status and error message
@@ -2887,7 +2933,7 @@ class DocumentValidationService:
         if name_match_required:
             # This would require company name from preconditions or input data
             # Implementation depends on your specific requirements
-            company_name = self._current_preconditions.get('company_name', '')
+            company_name = (preconditions or {}).get('company_name', '')
             if company_name:
                 name_fields = ['company_name', 'business_name', 'consumer_name', 'name']
                 doc_name = None
@@ -5226,8 +5272,9 @@ class DocumentValidationService:
             if bill_date:
                 try:
                     bill_dt = parser.parse(bill_date, dayfirst=True)
-                    if (datetime.now() - bill_dt).days > int(conditions["eb_bill_max_age_days"]):
-                        errors.append(f"Electricity bill is older ({(datetime.now() - bill_dt).days} days) than allowed ({conditions['eb_bill_max_age_days']} days)")
+                    bill_age_days = (datetime.now() - bill_dt).days
+                    if bill_age_days > int(conditions["eb_bill_max_age_days"]):
+                        errors.append(f"Electricity bill is older ({bill_age_days} days) than allowed ({conditions['eb_bill_max_age_days']} days)")
                 except Exception:
                     errors.append("Invalid date format in electricity bill")
             else:
@@ -1,7 +1,27 @@
 import requests
 import logging
-import json
-from urllib.parse import urlparse
+import orjson
+from requests.adapters import HTTPAdapter
+
+from models.document_models import validate_url
+
+def _build_session():
+    """
+    Build the HTTP session shared by the download and API helpers
+    
+    Connections are kept alive and pooled per host, so repeated requests to
+    the same storage/API host skip the TCP and TLS handshakes.
+    
+    Returns:
+        requests.Session: Pooled session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_SESSION = _build_session()
 
 class DocumentDownloader:
     """
@@ -37,7 +57,7 @@ class DocumentDownloader:
                 headers["Range"] = "bytes=0-"
             
             # Download document
-            response = requests.get(
+            response = _SESSION.get(
                 url, 
                 headers=headers, 
                 timeout=timeout,
@@ -66,19 +86,8 @@ class DocumentDownloader:
         Returns:
             bool: Whether URL is valid
         """
-        try:
-            # Parse URL
-            result = urlparse(url)
-            
-            # Check scheme and netloc
-            return all([
-                result.scheme in ['http', 'https'],
-                result.netloc
-            ])
-        
-        except Exception as e:
-            logging.error(f"URL validation error: {str(e)}")
-            return False
+        # Single precompiled regex match instead of a full urlparse
+        return validate_url(url)
     
     @staticmethod
     def verify_document_access(url):
@@ -93,7 +102,7 @@ class DocumentDownloader:
         """
         try:
             # HEAD request to verify access
-            response = requests.head(
+            response = _SESSION.head(
                 url, 
                 timeout=10, 
                 allow_redirects=True
@@ -149,7 +158,7 @@ class APIDocumentFetcher:
             logging.info(f"API Key (first 5 chars): {api_key[:5]}...")
             
             # Make API request
-            response = requests.get(
+            response = _SESSION.get(
                 url, 
                 headers=headers, 
                 timeout=30
@@ -167,7 +176,8 @@ class APIDocumentFetcher:
             
             # Parse JSON response
             try:
-                documents_data = response.json()
+                # Decoded straight from the raw bytes, with no intermediate str
+                documents_data = orjson.loads(response.content)
                 
                 # Validate response structure
                 if not isinstance(documents_data, dict):
@@ -182,7 +192,7 @@ class APIDocumentFetcher:
                 logging.info("Documents fetched successfully")
                 return documents_data
             
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logging.error("Failed to decode JSON response from API")
                 return None
         
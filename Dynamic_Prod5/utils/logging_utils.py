@@ -1,7 +1,80 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import time
 from config.settings import Config
 
+# Background listener that owns the root logger's real handlers
+_queue_listener = None
+
+# Write buffer size and maximum delay between flushes for queued file logs
+_LOG_BUFFER_SIZE = 65536
+_LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that batches writes through a large userspace buffer
+    
+    Records are flushed at most every _LOG_FLUSH_INTERVAL_SECONDS, or
+    immediately for ERROR and above, instead of after every record.
+    Anything still buffered is flushed by _FlushingQueueListener once the
+    queue has been idle for the same interval. Intended to run on the
+    QueueListener thread only.
+    """
+    
+    def __init__(self, filename, mode='a', encoding=None):
+        self._last_flush = time.monotonic()
+        self._force_flush = False
+        self._pending = False
+        super().__init__(filename, mode=mode, encoding=encoding)
+    
+    def _open(self):
+        return open(
+            self.baseFilename, self.mode, buffering=_LOG_BUFFER_SIZE,
+            encoding=self.encoding, errors=self.errors
+        )
+    
+    def emit(self, record):
+        self._force_flush = record.levelno >= logging.ERROR
+        self._pending = True
+        super().emit(record)
+    
+    def flush(self):
+        if self._force_flush or time.monotonic() - self._last_flush >= _LOG_FLUSH_INTERVAL_SECONDS:
+            self.flush_pending()
+    
+    def flush_pending(self):
+        """Write out buffered records regardless of the flush interval"""
+        super().flush()
+        self._last_flush = time.monotonic()
+        self._pending = False
+    
+    def close(self):
+        self._force_flush = True
+        super().close()
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes buffered file handlers when the queue idles
+    
+    Without this, the last records before a quiet period would sit in the
+    BufferedFileHandler buffer until the next record or shutdown.
+    """
+    
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=_LOG_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    if getattr(handler, '_pending', False):
+                        handler.flush_pending()
+
 def setup_logger(name='document_validation', log_level=None):
     """
     Configure and return a logger with console and file handlers
@@ -49,6 +122,61 @@ def setup_logger(name='document_validation', log_level=None):
     
     return logger
 
+def setup_queue_logging(log_file, level=logging.INFO):
+    """
+    Route root logging through an in-memory queue
+    
+    The calling thread only enqueues records; a background QueueListener
+    formats them and writes to the log file and console. Safe to call
+    more than once - only the first call configures the root logger,
+    later calls just add their log file to the running listener.
+    
+    Args:
+        log_file (str): Path of the log file
+        level (int): Root logging level
+    
+    Returns:
+        logging.handlers.QueueListener: Running listener
+    """
+    global _queue_listener
+    
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    if _queue_listener is not None:
+        log_path = os.path.abspath(log_file)
+        if not any(getattr(h, 'baseFilename', None) == log_path for h in _queue_listener.handlers):
+            file_handler = BufferedFileHandler(log_file)
+            file_handler.setFormatter(formatter)
+            _queue_listener.handlers = _queue_listener.handlers + (file_handler,)
+        return _queue_listener
+    
+    handlers = [
+        BufferedFileHandler(log_file),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Replace any handlers installed by earlier basicConfig calls
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    
+    _queue_listener = _FlushingQueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    
+    # Flush pending records on interpreter exit
+    atexit.register(_queue_listener.stop)
+    
+    return _queue_listener
+
 # Global logger instance
 logger = setup_logger()
 